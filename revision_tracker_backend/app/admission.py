@@ -0,0 +1,172 @@
+# app/admission.py
+"""
+Per-user admission control and load shedding.
+
+get_current_user calls admit() once the token is verified, before the
+request touches the database, so a refused request never waits for a
+pooled connection.
+
+Each user has a token bucket holding up to ADMISSION_BURST tokens,
+refilled at ADMISSION_RATE_PER_SECOND. A request costs
+ROUTE_COSTS[route template] tokens, or DEFAULT_COST: the unit-wise view
+and the analytics scan a user's whole history, a plain read doesn't.
+A request the bucket can't pay for gets 429 with Retry-After set to when
+it could, and takes nothing from the bucket.
+
+A pool checkout that finds every connection in use and waits longer
+than ADMISSION_SHED_WAIT_SECONDS means the database is the bottleneck.
+For the next ADMISSION_SHED_SECONDS, routes in SHEDDABLE_ROUTES get 503
+with Retry-After, leaving the pool to writes and the revision queue.
+
+admit() is a couple of dict lookups and some float arithmetic; it
+allocates nothing unless it refuses the request or meets a new user.
+Buckets are per process: with several workers each one enforces its
+share of the rate and burst.
+"""
+import math
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+
+import config
+from app.metrics import Counter, InstrumentedQueuePool
+
+DEFAULT_COST = 1
+
+# Route template -> tokens per request
+ROUTE_COSTS = {
+    "/revision-queue/unit-wise": 5,
+    "/revision-queue/what-if": 5,
+    "/revision-queue/unit-wise/rebuild": 5,
+    "/revisions/weekly-summary": 3,
+    "/revisions/weekly-summary/subject": 3,
+    "/revisions/subject-balance": 3,
+    "/revisions/daily-goal/subject": 3,
+    "/revisions/streak": 3,
+    "/revisions/daily-goal": 2,
+    "/revisions/batch": 3,
+    "/topics/bulk": 3,
+    "/syllabus/parse/batch": 3,
+    "/syllabus/near-duplicates": 5,
+    "/syllabus/import": 5,
+}
+
+# Read-only views a client can retry later; refused while the pool is
+# congested
+SHEDDABLE_ROUTES = frozenset({
+    "/revision-queue/unit-wise",
+    "/revision-queue/unit-wise/{subject}/{unit}/{bucket}",
+    "/revision-queue/what-if",
+    "/revisions/weekly-summary",
+    "/revisions/weekly-summary/subject",
+    "/revisions/subject-balance",
+    "/revisions/daily-goal/subject",
+    "/revisions/streak",
+    "/syllabus/near-duplicates",
+})
+
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests refused before reaching the database, by route and reason.",
+    ("route", "reason"),
+)
+
+# This process's share of every user's allowance
+_rate = config.ADMISSION_RATE_PER_SECOND / config.SERVER_WORKERS
+_burst = max(1.0, config.ADMISSION_BURST / config.SERVER_WORKERS)
+# A cost above the burst could never be paid
+_costs = {route: min(cost, _burst) for route, cost in ROUTE_COSTS.items()}
+_default_cost = min(DEFAULT_COST, _burst)
+
+# Seconds for an empty bucket to fill; a bucket idle this long is full
+# and can be dropped without changing any decision
+_refill_seconds = _burst / _rate
+
+_shed_until = 0.0
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, now: float):
+        self.tokens = _burst
+        self.updated = now
+
+
+_buckets: Dict[object, _Bucket] = {}
+
+
+def _new_bucket(user_key, now: float) -> _Bucket:
+    if len(_buckets) >= config.ADMISSION_MAX_USERS:
+        idle = [
+            key for key, bucket in _buckets.items()
+            if now - bucket.updated >= _refill_seconds
+        ]
+        for key in idle:
+            del _buckets[key]
+
+        # Still full of active users: forget the longest-tracked tenth,
+        # which just hands them a full bucket
+        excess = len(_buckets) - int(config.ADMISSION_MAX_USERS * 0.9)
+        if excess > 0:
+            for key in list(_buckets)[:excess]:
+                del _buckets[key]
+
+    bucket = _buckets[user_key] = _Bucket(now)
+    return bucket
+
+
+def _refuse(status_code: int, route: Optional[str], reason: str, wait: float):
+    ADMISSION_REJECTED.inc(route or "<unmatched>", reason)
+    raise HTTPException(
+        status_code=status_code,
+        detail="Too many requests" if status_code == 429 else "Server busy, please retry",
+        headers={"Retry-After": str(max(1, math.ceil(wait)))},
+    )
+
+
+def admit(user_key, route: Optional[str]) -> None:
+    """
+    Charge user_key for one request to route (a route template), or
+    raise HTTPException 429 / 503 with Retry-After.
+    """
+    if not config.ADMISSION_ENABLED:
+        return
+
+    now = time.monotonic()
+    if now < _shed_until and route in SHEDDABLE_ROUTES:
+        _refuse(status.HTTP_503_SERVICE_UNAVAILABLE, route, "shed", _shed_until - now)
+
+    bucket = _buckets.get(user_key)
+    if bucket is None:
+        bucket = _new_bucket(user_key, now)
+
+    cost = _costs.get(route, _default_cost)
+    tokens = bucket.tokens + (now - bucket.updated) * _rate
+    if tokens > _burst:
+        tokens = _burst
+    bucket.updated = now
+
+    if tokens < cost:
+        bucket.tokens = tokens
+        _refuse(status.HTTP_429_TOO_MANY_REQUESTS, route, "rate", (cost - tokens) / _rate)
+
+    bucket.tokens = tokens - cost
+
+
+def _note_pool_wait(seconds: float) -> None:
+    global _shed_until
+    if seconds <= config.ADMISSION_SHED_WAIT_SECONDS:
+        return
+
+    now = time.monotonic()
+    if now >= _shed_until:
+        print(
+            f"Waited {seconds:.2f}s for a pooled connection; shedding low-priority "
+            f"routes for {config.ADMISSION_SHED_SECONDS:g}s"
+        )
+    _shed_until = now + config.ADMISSION_SHED_SECONDS
+
+
+InstrumentedQueuePool.wait_listeners.append(_note_pool_wait)
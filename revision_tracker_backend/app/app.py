@@ -1,24 +1,56 @@
-from fastapi import FastAPI, Depends
+import asyncio
+import config
+from fastapi import FastAPI, Depends, Response
 from contextlib import asynccontextmanager
+from sqlalchemy import func, select
 from fastapi.middleware.cors import CORSMiddleware
 from app.db import engine, Base
+from app.jobs import run_job_runner
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.profiling import ProfilingMiddleware
+from app.parse_pool import shutdown_pool
+from app.progress import run_progress_sweeper
+from app.versioning import listen_for_data_versions
+from app.responses import FastJSONResponse
 from app import models  
 from app.auth import router as auth_router
 from app.dependencies import get_current_user
 from app.topics import router as topic_router
 from app.revisions import router as revisions_router
 from app.revision_queue import router as revision_queue_router
+from app.queue_stream import router as queue_stream_router
 from app.syllabus import router as syllabus_router
 from app.subjects import router as subjects_router
 from app.units import router as units_router
+from app.jobs import router as jobs_router
+from app.profiling import router as profiling_router
+
+# Advisory lock key held while creating tables at startup
+SCHEMA_LOCK_ID = 72_311_001
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
+        if config.SERVER_WORKERS > 1:
+            # Workers start together; create tables one at a time
+            await conn.execute(select(func.pg_advisory_xact_lock(SCHEMA_LOCK_ID)))
         await conn.run_sync(Base.metadata.create_all)
+    tasks = [asyncio.create_task(run_progress_sweeper())]
+    if config.JOB_RUNNER_ENABLED:
+        tasks.append(asyncio.create_task(run_job_runner()))
+    if config.SERVER_WORKERS > 1:
+        tasks.append(asyncio.create_task(listen_for_data_versions(engine)))
     yield
+    # The server has stopped taking requests and drained in-flight ones
+    # (up to SERVER_GRACEFUL_TIMEOUT_SECONDS). Jobs cut short here are
+    # retried once their lease expires.
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    shutdown_pool()
+    await engine.dispose()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,19 +63,29 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware)
+# Outermost, so the time includes every other middleware
+app.add_middleware(MetricsMiddleware)
 app.include_router(auth_router)
 app.include_router(topic_router)
 app.include_router(revisions_router)
 app.include_router(revision_queue_router)
+app.include_router(queue_stream_router)
 app.include_router(syllabus_router)
 app.include_router(subjects_router)
 app.include_router(units_router)
+app.include_router(jobs_router)
+app.include_router(profiling_router)
 
 
 @app.get("/")
 async def health():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
 @app.get("/me")
 async def read_me(user: models.User = Depends(get_current_user)):
     return {
@@ -1,19 +1,20 @@
 # app/dependencies.py
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
-from jose import JWTError
 
+from app.admission import admit
 from app.db import get_async_session
-from app.jwt import decode_access_token
+from app.jwt import InvalidTokenError, decode_access_token
 from app import models
 
 http_scheme = HTTPBearer()
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(http_scheme),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -26,7 +27,6 @@ async def get_current_user(
 
     try:
         payload = decode_access_token(token)
-        print("JWT PAYLOAD:", payload)
 
         user_id_str = payload.get("sub")
         if not user_id_str:
@@ -34,14 +34,17 @@ async def get_current_user(
 
         user_id = UUID(user_id_str)
 
-    except JWTError as e:
-        print("JWT ERROR:", repr(e))
+    except InvalidTokenError:
         raise credentials_exception
 
-    except Exception as e:
-        print("AUTH ERROR:", repr(e))
+    except Exception:
+        # e.g. a subject that isn't a UUID
         raise credentials_exception
 
+    # Before the lookup, so a refused request never takes a connection
+    route = getattr(request.scope.get("route"), "path", None)
+    admit(user_id, route)
+
     result = await session.execute(
         select(models.User).where(models.User.id == user_id)
     )
@@ -0,0 +1,444 @@
+# app/jobs.py
+"""
+Background jobs for work too long to hold a request open for: large
+syllabus imports, unit-wide writes, progress rebuilds and sweeps.
+
+A job is a row in the jobs table, so submitting one is part of the
+caller's transaction and queued jobs survive restarts. run_job_runner()
+runs in the app's lifespan. It claims ready jobs with FOR UPDATE SKIP
+LOCKED, so several processes can share the table, and runs up to
+JOB_WORKERS at once, with per-kind limits on top. A failed attempt is
+retried with exponential backoff until max_attempts; an HTTPException
+with a 4xx status fails the job at once, since retrying can't help.
+
+A running job holds a lease that is renewed while it runs. If its
+process dies, the lease runs out and the job is claimed again as a new
+attempt, so handlers must be safe to re-run after a partial attempt.
+
+Handlers are registered with @job_handler(kind) next to the code they
+run. run_pending_jobs() runs everything that is ready in the calling
+task, for tests and scripts that don't start the runner.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, delete, event, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import config
+from app.db import AsyncSessionLocal, get_async_session
+from app.dependencies import get_current_user
+from app.models import Job
+from app.responses import FastJSONResponse
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("succeeded", "failed")
+
+# Predicate of ix_jobs_active_unique_key, written out so ON CONFLICT
+# can infer the index
+_ACTIVE_UNIQUE = text("status IN ('queued', 'running')")
+
+# session.info key: set when the transaction queued a job
+_SUBMITTED = "submitted_jobs"
+
+JobHandler = Callable[[AsyncSession, Job], Awaitable[Optional[dict]]]
+
+# kind -> handler, attempts allowed, max running at once in this process
+_handlers: Dict[str, JobHandler] = {}
+_max_attempts: Dict[str, int] = {}
+_concurrency: Dict[str, int] = {}
+
+# kind -> jobs of that kind running in this process
+_running: Dict[str, int] = {}
+
+# Set when a job is submitted or finishes; created by the runner
+_wakeup: Optional[asyncio.Event] = None
+
+
+def job_handler(kind: str, max_attempts: int = 3, concurrency: Optional[int] = None):
+    """
+    Register the decorated coroutine as the handler for kind. It is
+    called with its own session and the claimed job, and returns the
+    job's result (a JSON-serializable dict) or None.
+    """
+    def register(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        _max_attempts[kind] = max_attempts
+        if concurrency is not None:
+            _concurrency[kind] = concurrency
+        return func
+    return register
+
+
+async def submit_job(
+    session: AsyncSession,
+    kind: str,
+    params: Optional[dict] = None,
+    user_id=None,
+    unique: bool = False,
+) -> Job:
+    """
+    Queue a job in the caller's transaction; the runner picks it up
+    once that commits. With unique, an existing queued or running job
+    of the same kind for the same user is returned instead; the
+    ix_jobs_active_unique_key index makes that hold under concurrent
+    submits too.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    values = {
+        "kind": kind,
+        "params": params or {},
+        "user_id": user_id,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": _max_attempts[kind],
+        "run_after": datetime.now(timezone.utc),
+    }
+
+    if unique:
+        job = await _submit_unique(session, values)
+        if job is None:
+            return await _active_unique_job(session, values)
+    else:
+        job = Job(**values)
+        session.add(job)
+        await session.flush()
+
+    session.info[_SUBMITTED] = True
+    return job
+
+
+def _unique_key(kind: str, user_id) -> str:
+    return kind if user_id is None else f"{kind}:{user_id}"
+
+
+async def _submit_unique(session: AsyncSession, values: dict) -> Optional[Job]:
+    """Insert the job unless one with its unique_key is active; None if one is."""
+    # A concurrent submit's uncommitted row makes this wait for that
+    # transaction, then skip the insert if it committed
+    return await session.scalar(
+        pg_insert(Job)
+        .values(unique_key=_unique_key(values["kind"], values["user_id"]), **values)
+        .on_conflict_do_nothing(
+            index_elements=[Job.unique_key],
+            index_where=_ACTIVE_UNIQUE,
+        )
+        .returning(Job)
+    )
+
+
+async def _active_unique_job(session: AsyncSession, values: dict) -> Job:
+    """The active job that blocked _submit_unique(), or a new one if it has since finished."""
+    while True:
+        existing = await session.scalar(
+            select(Job).where(
+                Job.unique_key == _unique_key(values["kind"], values["user_id"]),
+                Job.status.in_(ACTIVE_STATUSES),
+            )
+        )
+        if existing is not None:
+            return existing
+
+        job = await _submit_unique(session, values)
+        if job is not None:
+            session.info[_SUBMITTED] = True
+            return job
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_runner(session: Session) -> None:
+    if session.info.pop(_SUBMITTED, False) and _wakeup is not None:
+        _wakeup.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_submitted(session: Session) -> None:
+    session.info.pop(_SUBMITTED, None)
+
+
+async def report_job_progress(job: Job, done: int, total: Optional[int] = None) -> None:
+    """Record how far a running job has got, for GET /jobs/{id}."""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.attempts == job.attempts)
+            .values(done=done, total=total)
+        )
+        await session.commit()
+
+
+def job_status(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "done": job.done,
+        "total": job.total,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+async def accepted_job(session: AsyncSession, job: Job) -> FastJSONResponse:
+    """Commit the submission and answer 202 pointing at the job's status."""
+    await session.commit()
+    await session.refresh(job)
+    return FastJSONResponse(
+        job_status(job),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
+async def _claim_job() -> Optional[Job]:
+    """
+    Mark the oldest ready job this process can run as running and
+    return it: a queued job past its backoff, or a running one whose
+    lease has expired.
+    """
+    kinds = [
+        kind for kind in _handlers
+        if _running.get(kind, 0) < _concurrency.get(kind, config.JOB_WORKERS)
+    ]
+    if not kinds:
+        return None
+
+    async with AsyncSessionLocal() as session:
+        while True:
+            now = datetime.now(timezone.utc)
+            job = await session.scalar(
+                select(Job)
+                .where(
+                    Job.kind.in_(kinds),
+                    or_(
+                        and_(Job.status == "queued", Job.run_after <= now),
+                        and_(Job.status == "running", Job.lease_expires_at < now),
+                    ),
+                )
+                .order_by(Job.run_after)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if job is None:
+                return None
+
+            if job.status == "running" and job.attempts >= job.max_attempts:
+                # Its process died during the last attempt
+                job.status = "failed"
+                job.error = job.error or "Worker stopped during the last attempt"
+                job.finished_at = now
+                job.lease_expires_at = None
+                await session.commit()
+                continue
+
+            job.status = "running"
+            job.attempts += 1
+            job.started_at = now
+            job.lease_expires_at = now + timedelta(seconds=config.JOB_LEASE_SECONDS)
+            await session.commit()
+            return job
+
+
+async def _finish_job(job: Job, **values) -> None:
+    # A job whose lease ran out may already belong to a newer attempt
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.attempts == job.attempts)
+            .values(lease_expires_at=None, **values)
+        )
+        await session.commit()
+
+
+async def _renew_lease(job: Job) -> None:
+    while True:
+        await asyncio.sleep(config.JOB_LEASE_SECONDS / 3)
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(Job)
+                    .where(Job.id == job.id, Job.attempts == job.attempts)
+                    .values(lease_expires_at=datetime.now(timezone.utc)
+                            + timedelta(seconds=config.JOB_LEASE_SECONDS))
+                )
+                await session.commit()
+        except Exception as e:
+            print(f"Job lease renewal error ({job.id}): {e}")
+
+
+def _count_running(job: Job) -> None:
+    # Counted as soon as it is claimed, before its task starts, so the
+    # next _claim_job already sees it against the kind's limit
+    _running[job.kind] = _running.get(job.kind, 0) + 1
+
+
+async def _run_job(job: Job) -> None:
+    """Run a claimed job; the caller has already counted it in _running."""
+    lease = asyncio.create_task(_renew_lease(job))
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await _handlers[job.kind](session, job)
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            error = str(e.detail)
+            retry = e.status_code >= 500
+        else:
+            error = f"{type(e).__name__}: {e}"
+            retry = True
+
+        print(f"Job {job.kind} {job.id} attempt {job.attempts} failed: {error}")
+        now = datetime.now(timezone.utc)
+
+        if retry and job.attempts < job.max_attempts:
+            backoff = config.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            await _finish_job(
+                job,
+                status="queued",
+                error=error,
+                run_after=now + timedelta(seconds=backoff),
+            )
+        else:
+            await _finish_job(job, status="failed", error=error, finished_at=now)
+    else:
+        await _finish_job(
+            job,
+            status="succeeded",
+            result=result,
+            error=None,
+            finished_at=datetime.now(timezone.utc),
+        )
+    finally:
+        lease.cancel()
+        _running[job.kind] -= 1
+        if _wakeup is not None:
+            # A per-kind limit may have been holding other jobs back
+            _wakeup.set()
+
+
+async def run_pending_jobs() -> int:
+    """
+    Run ready jobs one at a time until none is left, in the calling
+    task. Jobs waiting out a retry backoff are not waited for. Returns
+    how many attempts were run.
+    """
+    ran = 0
+    while True:
+        job = await _claim_job()
+        if job is None:
+            return ran
+        _count_running(job)
+        await _run_job(job)
+        ran += 1
+
+
+async def prune_jobs() -> None:
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=config.JOB_RETENTION_HOURS)
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(Job).where(
+                Job.status.in_(FINISHED_STATUSES),
+                Job.finished_at < cutoff,
+            )
+        )
+        await session.commit()
+
+
+async def run_job_runner() -> None:
+    """
+    Claim and run jobs until cancelled. Jobs still running when it is
+    cancelled are retried once their lease expires.
+    """
+    global _wakeup
+    _wakeup = asyncio.Event()
+    slots = asyncio.Semaphore(config.JOB_WORKERS)
+    tasks = set()
+
+    def finished(task: asyncio.Task) -> None:
+        tasks.discard(task)
+        slots.release()
+
+    pruned_at = None
+    try:
+        while True:
+            await slots.acquire()
+
+            # Cleared before looking, so a submission that commits while
+            # we look still wakes the wait below
+            _wakeup.clear()
+            try:
+                job = await _claim_job()
+            except Exception as e:
+                print(f"Job runner error: {e}")
+                job = None
+
+            if job is not None:
+                _count_running(job)
+                task = asyncio.create_task(_run_job(job))
+                tasks.add(task)
+                task.add_done_callback(finished)
+                continue
+
+            slots.release()
+
+            now = datetime.now(timezone.utc)
+            if pruned_at is None or now - pruned_at > timedelta(hours=1):
+                pruned_at = now
+                try:
+                    await prune_jobs()
+                except Exception as e:
+                    print(f"Job prune error: {e}")
+
+            try:
+                await asyncio.wait_for(_wakeup.wait(), config.JOB_POLL_INTERVAL_SECONDS)
+            except TimeoutError:
+                pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        _wakeup = None
+
+
+@router.get("/")
+async def list_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    """The user's most recent jobs, newest first."""
+    result = await session.execute(
+        select(Job)
+        .where(Job.user_id == user.id)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+        .limit(limit)
+    )
+    return [job_status(job) for job in result.scalars().all()]
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: UUID,
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    """Status of a job: poll until status is "succeeded" or "failed"."""
+    job = await session.scalar(
+        select(Job).where(Job.id == job_id, Job.user_id == user.id)
+    )
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job_status(job)
@@ -2,14 +2,23 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from jose import jwt
 import config
 
+# jose (and the crypto backends it pulls in) is imported on first use,
+# so modules that only need get_current_user's signature stay cheap to
+# import.
+
+
+class InvalidTokenError(Exception):
+    """The token is malformed, expired or not signed with our key."""
+
 
 def create_access_token(
     data: dict,
     expires_delta: Optional[timedelta] = None,
 ) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
 
     expire = datetime.now(timezone.utc) + timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -25,9 +34,14 @@ def create_access_token(
 
 
 def decode_access_token(token: str) -> dict:
-    payload = jwt.decode(
-        token,
-        config.JWT_SECRET_KEY,
-        algorithms=[config.JWT_ALGORITHM],
-    )
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(
+            token,
+            config.JWT_SECRET_KEY,
+            algorithms=[config.JWT_ALGORITHM],
+        )
+    except JWTError as e:
+        raise InvalidTokenError(str(e)) from e
     return payload
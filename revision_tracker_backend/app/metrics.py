@@ -0,0 +1,273 @@
+# app/metrics.py
+"""
+Request and SQL metrics in the Prometheus text format, served on
+GET /metrics.
+
+MetricsMiddleware times every HTTP request by route template (so
+/topics/{topic_id} is one series, not one per id) and counts requests
+in flight. instrument_engine() hooks SQLAlchemy's cursor events to
+count queries and their time, both overall and per request: the
+middleware keeps a per-request tally in a ContextVar, which the event
+hooks see because SQLAlchemy's async layer runs them in the request's
+context. InstrumentedQueuePool times pool checkouts, including waits
+for a free connection.
+
+Metrics are plain in-process dicts updated from the event loop thread:
+an observation is a dict lookup and a bisect. With several worker
+processes each one reports its own numbers; scrape every worker or sum
+them in Prometheus.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Seconds; covers fast reads through slow imports
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label for requests that matched no route
+UNMATCHED_ROUTE = "<unmatched>"
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        _registry.append(self)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_label_text(self.label_names, labels)} {_number(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (non-cumulative, last is +Inf), sum]
+        self.values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = _label_text(self.label_names, labels, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            plain = _label_text(self.label_names, labels)
+            lines.append(f"{self.name}_sum{plain} {_number(total)}")
+            lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+def render_metrics() -> bytes:
+    return ("\n".join(metric.render() for metric in _registry) + "\n").encode("utf-8")
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status.",
+    ("method", "route", "status"),
+)
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ("method", "route"),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being handled, including open streams.",
+    ("method",),
+)
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "SQL statements executed, including background work.",
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Execution time of single SQL statements.",
+)
+DB_REQUEST_QUERIES = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while handling one request.",
+    ("route",),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_REQUEST_TIME = Histogram(
+    "db_query_seconds_per_request",
+    "Total SQL execution time while handling one request.",
+    ("route",),
+)
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waiting for one.",
+)
+
+# [queries, seconds] for the request being handled, if any
+_request_queries: ContextVar[Optional[list]] = ContextVar("request_queries", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+
+    elapsed = time.perf_counter() - started
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.observe(elapsed)
+
+    tally = _request_queries.get()
+    if tally is not None:
+        tally[0] += 1
+        tally[1] += elapsed
+
+
+def instrument_engine(engine) -> None:
+    """Record query counts and timings for an (async) engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """The async engine's default pool, timing every checkout."""
+
+    # Called with the duration in seconds of each checkout that had to
+    # wait for a connection to be returned (app.admission)
+    wait_listeners: List[Callable[[float], None]] = []
+
+    def connect(self):
+        # Otherwise the time is mostly the event loop being busy elsewhere
+        exhausted = self.checkedin() == 0 and self.overflow() >= self._max_overflow
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            elapsed = time.perf_counter() - started
+            DB_POOL_CHECKOUT.observe(elapsed)
+            if exhausted:
+                for listener in self.wait_listeners:
+                    listener(elapsed)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware, so streamed responses pass through untouched
+    and are timed until their last chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        tally = [0, 0.0]
+        token = _request_queries.set(tally)
+        HTTP_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec(method)
+            _request_queries.reset(token)
+
+            # Set by the router once the request is matched
+            route = scope.get("route")
+            route = getattr(route, "path", None) or UNMATCHED_ROUTE
+
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            HTTP_DURATION.observe(elapsed, method, route)
+            DB_REQUEST_QUERIES.observe(tally[0], route)
+            DB_REQUEST_TIME.observe(tally[1], route)
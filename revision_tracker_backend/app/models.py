@@ -1,5 +1,5 @@
 # app/models.py
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, Integer, JSON, String, DateTime, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -15,11 +15,20 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     priority_mode = Column(String, nullable=False, default="balanced")  # "balanced", "importance", "difficulty"
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped on every topic/revision write
 
 class Topic(Base):
     __tablename__ = "topics"
     __table_args__ = (
         UniqueConstraint("user_id", "name", name="uq_user_topic"),
+        # Keyset pagination orderings: GET /topics/ by (created_at, id),
+        # unit listings by (name, id) within a subject/unit.
+        Index("ix_topics_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_topics_user_subject_unit_name_id", "user_id", "subject", "unit", "name", "id"),
+        # Progress sweep: topics whose bucket is due to change
+        Index("ix_topics_bucket_changes_at", "bucket_changes_at"),
+        # Case-insensitive name lookups (syllabus import diff)
+        Index("ix_topics_user_lower_name", "user_id", text("lower(name)")),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -35,8 +44,33 @@ class Topic(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_revised = Column(DateTime(timezone=True), nullable=True)  # Added last_revised
 
+    # Unit-wise bucket and when it next changes; maintained by app/progress.py.
+    # A new row is due at once, so a writer that doesn't score it leaves
+    # it to the next sweep.
+    bucket = Column(String, nullable=True)
+    bucket_changes_at = Column(DateTime(timezone=True), nullable=True, server_default=func.now())
+
+class UnitProgress(Base):
+    __tablename__ = "unit_progress"
+    __table_args__ = (
+        Index("ix_unit_progress_user_subject_unit", "user_id", "subject", "unit"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+
+    subject = Column(String, nullable=False)
+    unit = Column(String, nullable=True)
+
+    overdue = Column(Integer, nullable=False, default=0)
+    due = Column(Integer, nullable=False, default=0)
+    fresh = Column(Integer, nullable=False, default=0)
+
 class Revision(Base):
     __tablename__ = "revisions"
+    __table_args__ = (
+        Index("ix_revisions_topic_revised_at", "topic_id", "revised_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     topic_id = Column(UUID(as_uuid=True), ForeignKey("topics.id"), nullable=False)
@@ -46,3 +80,40 @@ class Revision(Base):
 
     topic = relationship("Topic", backref="revisions")
 
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Runner claim: oldest queued job that is ready to run
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        Index("ix_jobs_user_created", "user_id", "created_at"),
+        # At most one active job per unique_key (submit_job(unique=True))
+        Index(
+            "ix_jobs_active_unique_key",
+            "unique_key",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)  # None for system jobs
+
+    kind = Column(String, nullable=False)
+    unique_key = Column(String, nullable=True)  # kind and user; set for unique jobs only
+    params = Column(JSON, nullable=False, default=dict)
+    status = Column(String, nullable=False, default="queued")  # "queued", "running", "succeeded", "failed"
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), server_default=func.now())  # retry backoff
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)  # running job is abandoned after this
+
+    done = Column(Integer, nullable=True)
+    total = Column(Integer, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,144 @@
+# app/near_duplicates.py
+"""
+Near-duplicate topic detection with character n-gram shingles and
+MinHash/LSH banding.
+
+Each name is reduced to a set of hashed character trigrams. A MinHash
+signature of NUM_PERM values estimates Jaccard similarity between those
+sets. The signature is cut into BANDS bands of ROWS values, and names
+sharing any band land in the same bucket. Only pairs that share a bucket
+are compared exactly, so the work grows with the number of names plus
+the number of real candidates instead of n².
+
+With 16 bands of 3 rows, a pair at Jaccard s becomes a candidate with
+probability 1 - (1 - s^3)^16: ~0.87 at s=0.5, ~0.99 at s=0.7.
+"""
+import random
+import re
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+SHINGLE_SIZE = 3
+NUM_PERM = 48
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.5
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(20240601)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME))
+    for _ in range(NUM_PERM)
+]
+
+_PARENTHESIZED_RE = re.compile(r"\([^)]*\)")
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+
+def canonical_name(name: str) -> str:
+    """
+    Lowercase, drop parenthesized asides such as "(BST)", keep only
+    letters and digits, and strip a plural "s" from longer words.
+    """
+    text = _PARENTHESIZED_RE.sub(" ", name.lower())
+    words = _NON_ALNUM_RE.sub(" ", text).split()
+    return " ".join(
+        w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+        for w in words
+    )
+
+
+def shingles(name: str) -> frozenset:
+    text = f" {canonical_name(name)} "
+    if len(text) <= SHINGLE_SIZE:
+        return frozenset([zlib.crc32(text.encode("utf-8"))])
+    return frozenset(
+        zlib.crc32(text[i:i + SHINGLE_SIZE].encode("utf-8"))
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    )
+
+
+def _permute(h: int) -> Tuple[int, ...]:
+    return tuple(((a * h + b) % _PRIME) & _MAX_HASH for a, b in _PERMUTATIONS)
+
+
+def minhash(hashes: frozenset, permuted: Dict[int, Tuple[int, ...]]) -> Tuple[int, ...]:
+    """
+    MinHash signature of a shingle set. permuted caches each shingle's
+    NUM_PERM permuted values; names share most trigrams, so each one is
+    computed once and the per-permutation minimum runs in C via zip/min.
+    """
+    rows = []
+    for h in hashes:
+        values = permuted.get(h)
+        if values is None:
+            values = permuted[h] = _permute(h)
+        rows.append(values)
+    return tuple(map(min, zip(*rows)))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def find_near_duplicates(
+    incoming: Sequence[str],
+    existing: Sequence[str] = (),
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Tuple[int, int, float]]:
+    """
+    Find near-duplicate names among incoming, and between incoming and
+    existing. Pairs among existing names alone are not reported, nor are
+    names that are equal ignoring case (exact duplicates are handled by
+    flatten_syllabus and the import diff).
+
+    Returns (i, j, similarity) with i an index into incoming and j an
+    index into incoming + existing (j >= len(incoming) means existing),
+    sorted by similarity, highest first.
+    """
+    names = list(incoming) + list(existing)
+    n_incoming = len(incoming)
+
+    sets = [shingles(name) for name in names]
+    buckets: Dict[Tuple, List[int]] = {}
+    permuted: Dict[int, Tuple[int, ...]] = {}
+
+    for index, hashes in enumerate(sets):
+        signature = minhash(hashes, permuted)
+        for band in range(BANDS):
+            key = (band, signature[band * ROWS:(band + 1) * ROWS])
+            buckets.setdefault(key, []).append(index)
+
+    checked = set()
+    matches = []
+
+    for members in buckets.values():
+        if len(members) < 2 or members[0] >= n_incoming:
+            # Indexes are appended in order, so if the first member is an
+            # existing topic, every member is.
+            continue
+
+        for x in range(len(members)):
+            i = members[x]
+            if i >= n_incoming:
+                break
+            for y in range(x + 1, len(members)):
+                j = members[y]
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+
+                if names[i].lower() == names[j].lower():
+                    continue
+
+                similarity = jaccard(sets[i], sets[j])
+                if similarity >= threshold:
+                    matches.append((i, j, round(similarity, 3)))
+
+    matches.sort(key=lambda m: m[2], reverse=True)
+    return matches
@@ -0,0 +1,89 @@
+# app/pagination.py
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import literal, tuple_
+
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque,
+    URL-safe cursor string.
+    """
+    raw = json.dumps([_dump(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor, converting each value back
+    with the matching parser (e.g. datetime.fromisoformat, UUID). Any
+    cursor encode_cursor couldn't have produced is a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        # Every sort key is encoded as a string (see _dump)
+        if (
+            not isinstance(values, list)
+            or len(values) != len(parsers)
+            or not all(isinstance(v, str) for v in values)
+        ):
+            raise ValueError("cursor shape mismatch")
+        return tuple(parse(v) for parse, v in zip(parsers, values))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def keyset_page(stmt, columns, parsers, cursor=None, limit=None):
+    """
+    Apply seek pagination to stmt ordered by columns.
+
+    The last column must be unique (the primary key) so the ordering is
+    total. One extra row is fetched so callers can tell whether another
+    page exists without a COUNT query.
+    """
+    if cursor:
+        values = decode_cursor(cursor, parsers)
+        stmt = stmt.where(
+            tuple_(*columns) > tuple_(*(
+                literal(v, col.type) for col, v in zip(columns, values)
+            ))
+        )
+
+    stmt = stmt.order_by(*columns)
+
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    return stmt
+
+
+def split_page(rows, limit, key):
+    """
+    Trim the look-ahead row from a keyset query and return
+    (rows, next_cursor). next_cursor is None on the last page.
+    """
+    rows = list(rows)
+    if limit is None or len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
@@ -0,0 +1,124 @@
+# app/parse_pool.py
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+import config
+from app.syllabus_cache import parse_and_flatten, parse_keyed, raw_key, syllabus_cache
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# concurrent.futures and multiprocessing are imported when the pool is
+# first needed; most syllabi are parsed inline.
+_pool: Optional["ProcessPoolExecutor"] = None
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_pool() -> "ProcessPoolExecutor":
+    global _pool
+    if _pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # spawn: never fork a process that holds an event loop and DB pool
+        _pool = ProcessPoolExecutor(
+            max_workers=config.PARSE_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _get_slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(config.PARSE_MAX_CONCURRENCY)
+    return _slots
+
+
+async def run_in_pool(func: Callable, *args: Any, action: str = "Syllabus parsing") -> Any:
+    """
+    Run func(*args) in the process pool. At most PARSE_MAX_CONCURRENCY
+    calls run at once, and each must finish within PARSE_TIMEOUT_SECONDS
+    of getting its slot, so documents queued behind a large batch don't
+    time out while waiting. func must be importable by the (spawned)
+    workers.
+    """
+    from concurrent.futures.process import BrokenProcessPool
+
+    slots = _get_slots()
+    loop = asyncio.get_running_loop()
+
+    try:
+        await slots.acquire()
+        try:
+            future = loop.run_in_executor(get_pool(), func, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        # The worker can't be interrupted, so the slot is held until it
+        # actually finishes, even if this request times out.
+        future.add_done_callback(lambda _: slots.release())
+        async with asyncio.timeout(config.PARSE_TIMEOUT_SECONDS):
+            return await asyncio.shield(future)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"{action} timed out",
+        )
+    except BrokenProcessPool:
+        shutdown_pool()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{action} unavailable, please retry",
+        )
+
+
+def check_document_size(text: str) -> None:
+    """Raise HTTPException 413 for a syllabus over SYLLABUS_MAX_DOCUMENT_CHARS."""
+    if len(text) > config.SYLLABUS_MAX_DOCUMENT_CHARS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Syllabus longer than {config.SYLLABUS_MAX_DOCUMENT_CHARS} characters",
+        )
+
+
+async def parse_syllabus_text(
+    text: str,
+    inline_max_chars: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Parse and flatten a syllabus without blocking the event loop.
+
+    Documents up to PARSE_INLINE_MAX_CHARS are parsed inline, which is
+    cheaper than the round trip to a worker. Larger ones go to the
+    process pool through run_in_pool(). inline_max_chars overrides the
+    threshold. Raises 413 over SYLLABUS_MAX_DOCUMENT_CHARS.
+    """
+    check_document_size(text)
+    if inline_max_chars is None:
+        inline_max_chars = config.PARSE_INLINE_MAX_CHARS
+
+    if len(text) <= inline_max_chars:
+        return parse_and_flatten(text)
+
+    exact = raw_key(text)
+    flat = syllabus_cache.get(exact, disk=False)
+    if flat is not None:
+        syllabus_cache.hits += 1
+        return flat
+
+    key, flat = await run_in_pool(parse_keyed, text)
+
+    size = syllabus_cache.remember(key, flat)
+    syllabus_cache.remember(exact, flat, size)
+    return flat
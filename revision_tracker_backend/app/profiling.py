@@ -0,0 +1,324 @@
+# app/profiling.py
+"""
+Opt-in sampling profiler for single requests.
+
+A request sent with the header "X-Profile: <PROFILING_TOKEN>" runs under
+the sampler. Its response carries X-Profile-Id, and the profile can be
+fetched from GET /debug/profiles/{id} with the same header. With
+PROFILE_SAMPLE_RATE > 0 and PROFILE_DIR set, that fraction of all
+requests is also sampled. Every PROFILE_WINDOW_SECONDS the slowest
+PROFILE_SLOWEST_N of them are written to one file in PROFILE_DIR.
+
+A sampler thread looks at the event loop thread every
+PROFILE_INTERVAL_MS, attributing each sample to a profiled request:
+- "on-cpu": the running task belongs to the request (its own task, or
+  one it spawned, found through a ContextVar). The sample is the loop
+  thread's stack.
+- "off-cpu": the request's task is suspended, e.g. waiting for the
+  database or for the loop to get round to it. The sample is the chain
+  of coroutines it is awaiting through.
+
+Profiles are in the collapsed-stack format ("frame;frame;frame count"
+per line) that flamegraph.pl and speedscope read.
+
+Requests that aren't profiled pay for one header lookup, plus one
+random() call when sampling is on. The thread only runs while a profile
+is active.
+"""
+import asyncio
+import heapq
+import hmac
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response
+
+import config
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+PROFILE_HEADER = b"x-profile"
+MAX_STACK_DEPTH = 128
+
+# The profile of the request this task is working on, if any
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "current_profile", default=None
+)
+
+# id -> profile, started on request; oldest dropped past PROFILE_KEEP
+_stored: "OrderedDict[str, RequestProfile]" = OrderedDict()
+
+_active: Dict[int, "RequestProfile"] = {}
+_active_lock = threading.Lock()
+_wake_sampler = threading.Event()
+_sampler: Optional[threading.Thread] = None
+
+# Slowest sampled requests of the current window, as a min-heap
+_window: List[tuple] = []
+_window_started = time.monotonic()
+_window_seq = itertools.count()
+
+
+class RequestProfile:
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.started_at = datetime.now(timezone.utc)
+        self.duration: Optional[float] = None
+        self.stacks: Counter = Counter()
+
+        self.task = asyncio.current_task()
+        self.loop = asyncio.get_running_loop()
+        self.thread_id = threading.get_ident()
+
+    def folded(self, root: Optional[str] = None) -> str:
+        prefix = f"{root};" if root else ""
+        return "".join(
+            f"{prefix}{stack} {count}\n" for stack, count in self.stacks.items()
+        )
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 1) if self.duration else None,
+            "samples": sum(self.stacks.values()),
+        }
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _thread_stack(frame) -> List:
+    frames = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        # Everything below the loop's callback runner is the loop itself
+        if frame.f_code.co_name == "_run" and frame.f_code.co_filename.endswith(
+            os.path.join("asyncio", "events.py")
+        ):
+            break
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _awaiting_stack(task) -> List:
+    frames = []
+    coro = task.get_coro()
+    while coro is not None and len(frames) < MAX_STACK_DEPTH:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None)
+    return frames
+
+
+def _belongs_to(task, profile: RequestProfile) -> bool:
+    if task is profile.task:
+        return True
+    get_context = getattr(task, "get_context", None)
+    context = get_context() if get_context else getattr(task, "_context", None)
+    return context is not None and context.get(_current_profile) is profile
+
+
+def _take_samples() -> None:
+    with _active_lock:
+        profiles = list(_active.values())
+
+    frames = sys._current_frames()
+    for profile in profiles:
+        running = asyncio.current_task(profile.loop)
+        if running is not None and _belongs_to(running, profile):
+            kind = "on-cpu"
+            stack = _thread_stack(frames.get(profile.thread_id))
+        else:
+            kind = "off-cpu"
+            stack = _awaiting_stack(profile.task)
+
+        if not stack:
+            continue
+        key = ";".join([kind, *map(_frame_label, stack)])
+        with _active_lock:
+            # _stop() may have run since we looked; its stacks are final
+            # once it returns, so drop a sample that comes after it
+            if _active.get(id(profile)) is profile:
+                profile.stacks[key] += 1
+
+
+def _run_sampler() -> None:
+    interval = config.PROFILE_INTERVAL_MS / 1000
+    while True:
+        _wake_sampler.wait()
+        while _active:
+            try:
+                _take_samples()
+            except Exception as e:
+                # A frame or task can change under us; skip the tick
+                print(f"Profiler sample error: {e!r}")
+            time.sleep(interval)
+        _wake_sampler.clear()
+        if _active:
+            _wake_sampler.set()
+
+
+def _start(profile: RequestProfile) -> None:
+    global _sampler
+    with _active_lock:
+        _active[id(profile)] = profile
+    if _sampler is None:
+        _sampler = threading.Thread(target=_run_sampler, name="request-profiler", daemon=True)
+        _sampler.start()
+    _wake_sampler.set()
+
+
+def _stop(profile: RequestProfile) -> None:
+    with _active_lock:
+        _active.pop(id(profile), None)
+
+
+def _token_matches(value: Optional[bytes]) -> bool:
+    """
+    Compare a raw X-Profile header with PROFILING_TOKEN. Bytes, since
+    compare_digest refuses non-ASCII str and a header can hold any byte.
+    """
+    token = config.PROFILING_TOKEN
+    return bool(token and value) and hmac.compare_digest(value, token.encode())
+
+
+def _store(profile: RequestProfile) -> None:
+    _stored[profile.id] = profile
+    while len(_stored) > config.PROFILE_KEEP:
+        _stored.popitem(last=False)
+
+
+def _write_window(path: str, profiles: List[RequestProfile]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        for profile in profiles:
+            root = (
+                f"{profile.method} {profile.route or profile.path} "
+                f"{profile.duration * 1000:.0f}ms {profile.id[:8]}"
+            )
+            f.write(profile.folded(root))
+
+
+async def _record_sampled(profile: RequestProfile) -> None:
+    global _window, _window_started
+
+    entry = (profile.duration, next(_window_seq), profile)
+    if len(_window) < config.PROFILE_SLOWEST_N:
+        heapq.heappush(_window, entry)
+    elif entry[0] > _window[0][0]:
+        heapq.heapreplace(_window, entry)
+
+    now = time.monotonic()
+    if now - _window_started < config.PROFILE_WINDOW_SECONDS:
+        return
+
+    slowest = [p for _, _, p in sorted(_window, key=lambda e: e[0], reverse=True)]
+    _window, _window_started = [], now
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(config.PROFILE_DIR, f"slowest-{stamp}-{os.getpid()}.folded")
+    try:
+        await asyncio.to_thread(_write_window, path, slowest)
+    except OSError as e:
+        print(f"Profile write error: {e}")
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                requested = value
+                break
+
+        explicit = requested is not None and _token_matches(requested)
+        sampled = (
+            not explicit
+            and config.PROFILE_SAMPLE_RATE > 0
+            and config.PROFILE_DIR is not None
+            and random.random() < config.PROFILE_SAMPLE_RATE
+        )
+        if not (explicit or sampled):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+
+        async def send_with_id(message):
+            if explicit and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_profile.set(profile)
+        _start(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.duration = time.perf_counter() - started
+            _stop(profile)
+            _current_profile.reset(token)
+
+            route = scope.get("route")
+            profile.route = getattr(route, "path", None)
+
+        if explicit:
+            _store(profile)
+        else:
+            await _record_sampled(profile)
+
+
+def _require_token(value: Optional[str]) -> None:
+    # Starlette decodes headers as latin-1, which gives back the raw bytes
+    if value is None or not _token_matches(value.encode("latin-1")):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/profiles")
+async def list_profiles(x_profile: Optional[str] = Header(None)):
+    """Profiles kept from requests sent with X-Profile, newest first."""
+    _require_token(x_profile)
+    return [profile.summary() for profile in reversed(_stored.values())]
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    """One request's profile as collapsed stacks (flamegraph input)."""
+    _require_token(x_profile)
+    profile = _stored.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return Response(profile.folded(), media_type="text/plain; charset=utf-8")
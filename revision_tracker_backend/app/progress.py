@@ -0,0 +1,273 @@
+# app/progress.py
+"""
+Persisted unit-wise progress counters.
+
+Every topic stores its current bucket (overdue / due / fresh, scored with
+the balanced weighting the unit-wise views use, at the day's scoring
+time) and bucket_changes_at, the rollover at which it next moves up a
+bucket if it isn't revised. unit_progress
+holds the per-(user, subject, unit) count of topics in each bucket.
+
+Writes call refresh_progress() inside their transaction for the topics
+and units they touched. The sweep rescores topics whose
+bucket_changes_at has passed, so counters are at most one sweep
+interval behind the clock. Sweeps, and full rebuilds of a user's
+counters, run as background jobs (app/jobs.py). Progress reads use the
+counters directly.
+
+Writers take locks in the order topic rows, user row (via
+bump_data_version), counters, so they can't deadlock each other.
+"""
+import asyncio
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import config
+from app.db import AsyncSessionLocal
+from app.jobs import job_handler, report_job_progress, submit_job
+from app.models import Job, Topic, UnitProgress
+from app.revision_logic import bucket_from_priority, compute_priority, next_bucket_change
+from app.versioning import bump_data_version, next_scoring_time, scoring_time
+
+BUCKETS = ("overdue", "due", "fresh")
+
+
+def bucket_state(topic, now: datetime) -> Tuple[str, Optional[datetime]]:
+    """
+    The topic's bucket scored at now, a scoring time, and the scoring
+    time at which the bucket next changes (None if it never will).
+    """
+    changes_at = next_bucket_change(topic, now)
+    return (
+        bucket_from_priority(compute_priority(topic, now=now)),
+        next_scoring_time(changes_at) if changes_at else None,
+    )
+
+
+def _unit_filter(column_subject, column_unit, units):
+    # == None compiles to IS NULL, so topics without a unit match too
+    return or_(*(
+        and_(column_subject == subject, column_unit == unit)
+        for subject, unit in units
+    ))
+
+
+async def rescore_topics(session: AsyncSession, user_id, *criteria) -> dict:
+    """
+    Rescore the user's topics matching criteria and store their bucket
+    and bucket_changes_at. Counters are not touched; returns the change
+    per unit, {(subject, unit): {bucket: delta}}, with an entry (possibly
+    all zero) for every unit a matching topic is in.
+    """
+    now = scoring_time()
+    result = await session.execute(
+        select(
+            Topic.id,
+            Topic.subject,
+            Topic.unit,
+            Topic.difficulty,
+            Topic.importance,
+            Topic.last_revised,
+            Topic.bucket,
+            Topic.bucket_changes_at,
+        ).where(Topic.user_id == user_id, *criteria)
+    )
+
+    deltas = {}
+    changed = []
+    for topic in result.all():
+        unit_delta = deltas.setdefault(
+            (topic.subject, topic.unit), dict.fromkeys(BUCKETS, 0)
+        )
+        bucket, changes_at = bucket_state(topic, now)
+        if bucket != topic.bucket or changes_at != topic.bucket_changes_at:
+            changed.append({
+                "id": topic.id,
+                "bucket": bucket,
+                "bucket_changes_at": changes_at,
+            })
+        if bucket != topic.bucket:
+            unit_delta[bucket] += 1
+            if topic.bucket is not None:
+                unit_delta[topic.bucket] -= 1
+
+    if changed:
+        await session.execute(update(Topic), changed)
+
+    return deltas
+
+
+async def refresh_progress(
+    session: AsyncSession,
+    user_id,
+    *criteria,
+    units: Iterable[Tuple[str, Optional[str]]] = (),
+) -> None:
+    """
+    Rescore the user's topics matching criteria, store their bucket and
+    bucket_changes_at, and recount the counters of every unit they are
+    in. units adds (subject, unit) pairs to recount that the write moved
+    or deleted topics out of.
+
+    Recounting whole units rather than applying per-topic deltas keeps
+    set-based writes (bulk patch, unit rename/delete) exact without
+    reading every row first.
+
+    Call after bump_data_version(): its lock on the user's row
+    serializes counter updates between concurrent writes.
+    """
+    touched = set(units)
+    if criteria:
+        touched.update(await rescore_topics(session, user_id, *criteria))
+
+    if touched:
+        await _recount_units(session, user_id, touched)
+
+
+async def apply_progress_deltas(session: AsyncSession, user_id, deltas: dict) -> None:
+    """
+    Add {(subject, unit): {bucket: delta}} to the unit counters, creating
+    missing rows and dropping emptied ones. For writes that know exactly
+    which scored topics came and went, e.g. one chunk of a unit-wide
+    operation, where recounting the whole unit each time would be
+    quadratic. Same locking rule as refresh_progress().
+    """
+    for (subject, unit), delta in deltas.items():
+        if not any(delta.values()):
+            continue
+
+        row = await session.scalar(
+            select(UnitProgress).where(
+                UnitProgress.user_id == user_id,
+                UnitProgress.subject == subject,
+                UnitProgress.unit == unit,
+            )
+        )
+        if row is None:
+            row = UnitProgress(user_id=user_id, subject=subject, unit=unit)
+            for bucket in BUCKETS:
+                setattr(row, bucket, 0)
+            session.add(row)
+
+        for bucket in BUCKETS:
+            setattr(row, bucket, getattr(row, bucket) + delta.get(bucket, 0))
+
+        if not any(getattr(row, bucket) for bucket in BUCKETS):
+            if row in session.new:
+                session.expunge(row)
+            else:
+                await session.delete(row)
+
+
+async def _recount_units(session: AsyncSession, user_id, units: set) -> None:
+    result = await session.execute(
+        select(Topic.subject, Topic.unit, Topic.bucket, func.count())
+        .where(
+            Topic.user_id == user_id,
+            Topic.bucket.isnot(None),
+            _unit_filter(Topic.subject, Topic.unit, units),
+        )
+        .group_by(Topic.subject, Topic.unit, Topic.bucket)
+    )
+
+    counts = {key: dict.fromkeys(BUCKETS, 0) for key in units}
+    for subject, unit, bucket, n in result.all():
+        counts[(subject, unit)][bucket] = n
+
+    await session.execute(
+        delete(UnitProgress).where(
+            UnitProgress.user_id == user_id,
+            _unit_filter(UnitProgress.subject, UnitProgress.unit, units),
+        )
+    )
+
+    rows = [
+        {"user_id": user_id, "subject": subject, "unit": unit, **bucket_counts}
+        for (subject, unit), bucket_counts in counts.items()
+        if any(bucket_counts.values())
+    ]
+    if rows:
+        await session.execute(insert(UnitProgress), rows)
+
+
+async def sweep_progress(session: AsyncSession, limit: Optional[int] = None) -> int:
+    """
+    Rescore up to limit topics whose bucket_changes_at has passed,
+    committing per user. Unscored topics are included, since the column
+    defaults to the insert time. Returns how many topics were picked up.
+    """
+    limit = limit or config.PROGRESS_SWEEP_BATCH_SIZE
+    now = datetime.now(timezone.utc)
+
+    result = await session.execute(
+        select(Topic.user_id, Topic.id)
+        .where(Topic.bucket_changes_at <= now)
+        .limit(limit)
+    )
+
+    by_user = {}
+    for user_id, topic_id in result.all():
+        by_user.setdefault(user_id, []).append(topic_id)
+
+    for user_id, topic_ids in by_user.items():
+        await session.execute(
+            select(Topic.id).where(Topic.id.in_(topic_ids)).with_for_update()
+        )
+        # Crossings change time-dependent views, so cached copies go too
+        await bump_data_version(session, user_id)
+        await refresh_progress(session, user_id, Topic.id.in_(topic_ids))
+        await session.commit()
+
+    return sum(len(ids) for ids in by_user.values())
+
+
+@job_handler("progress_sweep", max_attempts=1, concurrency=1)
+async def _sweep_job(session: AsyncSession, job: Job) -> dict:
+    swept = 0
+    while True:
+        n = await sweep_progress(session)
+        swept += n
+        await report_job_progress(job, swept)
+        if n < config.PROGRESS_SWEEP_BATCH_SIZE:
+            return {"swept": swept}
+
+
+async def rebuild_progress(session: AsyncSession, user_id) -> int:
+    """
+    Rescore all of the user's topics and recount every unit from
+    scratch, dropping counter rows for units that no longer exist.
+    Returns how many units were recounted.
+    """
+    result = await session.execute(
+        select(UnitProgress.subject, UnitProgress.unit)
+        .where(UnitProgress.user_id == user_id)
+    )
+    stale = set(result.all())
+
+    await bump_data_version(session, user_id)
+    units = set(await rescore_topics(session, user_id, true())) | stale
+    if units:
+        await _recount_units(session, user_id, units)
+    await session.commit()
+    return len(units)
+
+
+@job_handler("progress_rebuild", concurrency=1)
+async def _rebuild_job(session: AsyncSession, job: Job) -> dict:
+    return {"units": await rebuild_progress(session, job.user_id)}
+
+
+async def run_progress_sweeper() -> None:
+    """Queue a sweep job every PROGRESS_SWEEP_INTERVAL_SECONDS."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                await submit_job(session, "progress_sweep", unique=True)
+                await session.commit()
+        except Exception as e:
+            print(f"Progress sweep error: {e}")
+
+        await asyncio.sleep(config.PROGRESS_SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,208 @@
+# app/queue_stream.py
+"""
+Server-Sent Events push of the top of the revision queue.
+
+A connection receives a "snapshot" event with the current top-K, then a
+"delta" event whenever that changes: topics that entered, left, or
+moved (new rank, priority or fields). The top-K is recomputed only when
+one of the user's own writes commits in this process (see
+versioning.watch_data_version) or at UTC day rollover. Priorities are
+scored at versioning.scoring_time(), so nothing else changes them.
+Between those the connection just waits on an Event and a timer. Each
+connection holds only its last top-K list and never keeps a database
+session open while idle.
+
+A stream counts against QUEUE_STREAM_MAX_PER_USER from the moment the
+handler accepts it until its response ends, started or not.
+"""
+import asyncio
+import heapq
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import config
+from app import models, read_models
+from app.db import AsyncSessionLocal, get_async_session
+from app.dependencies import get_current_user
+from app.responses import SSE_KEEPALIVE, sse_event
+from app.revision_logic import compute_priority
+from app.versioning import (
+    scoring_day,
+    scoring_time,
+    seconds_until_rollover,
+    unwatch_data_version,
+    watch_data_version,
+)
+
+router = APIRouter(prefix="/revision-queue", tags=["revision"])
+
+DEFAULT_TOP_K = 20
+MAX_TOP_K = 100
+
+# user id -> open stream count, reserved before the response starts
+_open_streams: Dict[object, int] = {}
+
+
+class _StreamSlot:
+    """
+    One of the user's QUEUE_STREAM_MAX_PER_USER streams, counted from the
+    moment the handler accepts the request; release() may be called more
+    than once.
+    """
+    __slots__ = ("user_id", "held")
+
+    def __init__(self, user_id):
+        # No await between the check and the increment, so concurrent
+        # connects can't all get past the cap
+        count = _open_streams.get(user_id, 0)
+        if count >= config.QUEUE_STREAM_MAX_PER_USER:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many open queue streams",
+            )
+        _open_streams[user_id] = count + 1
+        self.user_id = user_id
+        self.held = True
+
+    def release(self) -> None:
+        if not self.held:
+            return
+        self.held = False
+        _open_streams[self.user_id] -= 1
+        if not _open_streams[self.user_id]:
+            del _open_streams[self.user_id]
+
+
+class _QueueStreamResponse(StreamingResponse):
+    """Releases the stream's slot even if the body never started."""
+
+    def __init__(self, content, slot: _StreamSlot, **kwargs):
+        super().__init__(content, **kwargs)
+        self.slot = slot
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.slot.release()
+
+
+async def top_k_queue(user_id, k: int) -> List[dict]:
+    """
+    The first k entries of GET /revision-queue/ for the user, ties
+    broken by id so unchanged data always ranks the same way.
+    """
+    async with AsyncSessionLocal() as session:
+        mode = await session.scalar(
+            select(models.User.priority_mode).where(models.User.id == user_id)
+        )
+        result = await session.execute(read_models.queue_topics(user_id))
+        topics = result.all()
+
+    now = scoring_time()
+    scored = heapq.nlargest(
+        k,
+        ((compute_priority(topic, mode, now), topic) for topic in topics),
+        key=lambda pair: (pair[0], pair[1].id),
+    )
+
+    return [
+        {
+            "id": topic.id,
+            "subject": topic.subject,
+            "unit": topic.unit,
+            "name": topic.name,
+            "priority": priority,
+            "last_revised": topic.last_revised,
+        }
+        for priority, topic in scored
+    ]
+
+
+def diff_top_k(previous: List[dict], current: List[dict]) -> Optional[dict]:
+    """
+    Changes from previous to current as entered/left/moved, or None if
+    nothing changed. entered and moved carry the full topic and its new
+    0-based rank; left carries ids.
+    """
+    before = {topic["id"]: (rank, topic) for rank, topic in enumerate(previous)}
+    entered, moved = [], []
+
+    for rank, topic in enumerate(current):
+        old = before.pop(topic["id"], None)
+        if old is None:
+            entered.append({**topic, "rank": rank})
+        elif old != (rank, topic):
+            moved.append({**topic, "rank": rank})
+
+    left = list(before)
+    if not (entered or left or moved):
+        return None
+
+    return {"entered": entered, "left": left, "moved": moved}
+
+
+async def queue_events(user_id, k: int, slot: _StreamSlot):
+    changed = watch_data_version(user_id)
+    try:
+        day = scoring_day()
+        previous = await top_k_queue(user_id, k)
+        yield sse_event("snapshot", {"k": k, "topics": previous})
+
+        while True:
+            timeout = min(
+                config.QUEUE_STREAM_KEEPALIVE_SECONDS,
+                seconds_until_rollover(),
+            )
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except TimeoutError:
+                pass
+
+            if not changed.is_set() and scoring_day() == day:
+                yield SSE_KEEPALIVE
+                continue
+
+            # Writes that commit while we recompute set it again
+            changed.clear()
+            day = scoring_day()
+
+            current = await top_k_queue(user_id, k)
+            delta = diff_top_k(previous, current)
+            previous = current
+
+            if delta:
+                yield sse_event("delta", delta)
+            else:
+                yield SSE_KEEPALIVE
+    finally:
+        unwatch_data_version(user_id, changed)
+        slot.release()
+
+
+@router.get("/stream")
+async def stream_revision_queue(
+    k: int = Query(DEFAULT_TOP_K, ge=1, le=MAX_TOP_K),
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    """
+    Push the top k of the revision queue as Server-Sent Events: one
+    "snapshot", then a "delta" after each change. Replaces polling
+    GET /revision-queue/.
+    """
+    # The auth lookup's session would otherwise hold a pooled
+    # connection for as long as the stream stays open
+    await session.close()
+
+    slot = _StreamSlot(user.id)
+    return _QueueStreamResponse(
+        queue_events(user.id, k, slot),
+        slot,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
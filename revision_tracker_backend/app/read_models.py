@@ -0,0 +1,82 @@
+# app/read_models.py
+"""
+Projected queries for read-only endpoints.
+
+Each builder selects only the columns an endpoint returns or scores on,
+so results come back as lightweight Row tuples (attribute access, no
+identity map, no change tracking) instead of full ORM instances. Rows
+expose the same attribute names as models.Topic, so they can be passed
+straight to revision_logic.compute_priority.
+"""
+from sqlalchemy import select
+
+from app.models import Topic, UnitProgress
+
+# GET /topics/ (TopicRead shape)
+TOPIC_READ_COLUMNS = (
+    Topic.id,
+    Topic.subject,
+    Topic.unit,
+    Topic.name,
+    Topic.difficulty,
+    Topic.importance,
+    Topic.created_at,
+    Topic.last_revised,
+)
+
+# Topic listings within one subject/unit
+UNIT_TOPIC_COLUMNS = (
+    Topic.id,
+    Topic.name,
+    Topic.difficulty,
+    Topic.importance,
+    Topic.last_revised,
+)
+
+# Everything the revision queues score and return
+QUEUE_COLUMNS = (
+    Topic.id,
+    Topic.subject,
+    Topic.unit,
+    Topic.name,
+    Topic.difficulty,
+    Topic.importance,
+    Topic.last_revised,
+)
+
+# Persisted bucket counters (app/progress.py)
+UNIT_PROGRESS_COLUMNS = (
+    UnitProgress.subject,
+    UnitProgress.unit,
+    UnitProgress.overdue,
+    UnitProgress.due,
+    UnitProgress.fresh,
+)
+
+
+def user_topics(user_id):
+    return select(*TOPIC_READ_COLUMNS).where(Topic.user_id == user_id)
+
+
+def unit_topics(user_id, subject: str, unit: str):
+    return select(*UNIT_TOPIC_COLUMNS).where(
+        Topic.user_id == user_id,
+        Topic.subject == subject,
+        Topic.unit == unit,
+    )
+
+
+def queue_topics(user_id):
+    return select(*QUEUE_COLUMNS).where(Topic.user_id == user_id)
+
+
+def unit_queue_topics(user_id, subject: str, unit: str):
+    return select(*QUEUE_COLUMNS).where(
+        Topic.user_id == user_id,
+        Topic.subject == subject,
+        Topic.unit == unit,
+    )
+
+
+def unit_progress(user_id):
+    return select(*UNIT_PROGRESS_COLUMNS).where(UnitProgress.user_id == user_id)
@@ -0,0 +1,105 @@
+# app/responses.py
+import uuid
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+
+def _default(obj: Any) -> Any:
+    # orjson only encodes uuid.UUID itself natively; asyncpg returns its
+    # own UUID subclass for uuid columns fetched as plain Row values.
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson.
+
+    UUIDs and datetimes are encoded natively in the same formats
+    jsonable_encoder produces (canonical UUID strings, isoformat()
+    timestamps). Non-string dict keys such as a None unit are stringified
+    the way json.dumps does.
+    """
+
+    media_type = "application/json"
+    option = orjson.OPT_NON_STR_KEYS
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=self.option)
+
+
+class ModelJSONResponse(FastJSONResponse):
+    """
+    Same as FastJSONResponse but writes UTC timestamps with a "Z" suffix,
+    matching Pydantic's serialization for endpoints that declare a
+    response_model.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def fast_json(
+    content: Any,
+    response: Optional[Response] = None,
+    response_class: type[FastJSONResponse] = FastJSONResponse,
+) -> FastJSONResponse:
+    """
+    Serialize content straight to bytes, skipping response_model
+    validation and jsonable_encoder. Headers already set on the injected
+    response (ETag, X-Next-Cursor) are carried over.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return response_class(content, headers=headers)
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """One Server-Sent Events message with a JSON payload."""
+    payload = orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+
+
+# SSE comment line; clients ignore it, proxies see the connection is alive
+SSE_KEEPALIVE = b": keepalive\n\n"
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that doesn't watch for client disconnects. Needed
+    by handlers still reading the request body while they stream the
+    reply (Starlette's listener calls receive() concurrently, which would
+    swallow the chunks request.stream() is waiting for), and by work that
+    must run to completion rather than be cancelled with the request.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+
+class PrimedStreamingResponse(BodyStreamingResponse):
+    """
+    BodyStreamingResponse that sends the status line only once the first
+    chunk is ready, so the handler can still refuse the request (e.g.
+    with 413) after looking at the start of the body.
+    """
+
+    async def stream_response(self, send) -> None:
+        chunks = self.body_iterator.__aiter__()
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            first = None
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if first is not None:
+            await send({"type": "http.response.body", "body": first, "more_body": True})
+            async for chunk in chunks:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -1,6 +1,6 @@
 import math
-from datetime import datetime, timezone
-from typing import Literal
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Literal, Optional, Tuple
 
 priority_modes = {
     "balanced": {"time": 0.55, "difficulty": 0.25, "importance": 0.20},
@@ -16,22 +16,49 @@ def estimate_stability(topic):
     return max(base * difficulty_factor * importance_factor, 1)
 
 
-def estimate_retrievability(topic):
+def estimate_retrievability(topic, now: Optional[datetime] = None):
     if not topic.last_revised:
         return 0.0
-    days = (datetime.now(timezone.utc) - topic.last_revised).days
+    now = now or datetime.now(timezone.utc)
+    # Revised after now, e.g. today when scoring against midnight
+    days = max((now - topic.last_revised).days, 0)
     stability = estimate_stability(topic)
     return math.exp(-days / stability)
 
 
-def compute_priority(topic, mode: Literal["balanced", "exam", "revision"] = "balanced") -> float:
+def compute_priority(
+    topic,
+    mode: Literal["balanced", "exam", "revision"] = "balanced",
+    now: Optional[datetime] = None,
+) -> float:
+    return priority_from_retrievability(
+        topic, estimate_retrievability(topic, now), mode
+    )
+
+
+def priority_from_retrievability(topic, retrievability: float, mode: str = "balanced") -> float:
     weights = priority_modes.get(mode, priority_modes["balanced"])
+    return weighted_priority(weights, (
+        1 - retrievability,  # forgetting risk: 0 → remembered, 1 → forgotten
+        topic.difficulty / 5,
+        topic.importance / 5,
+    ))
+
+
+def priority_factors(topic, now: Optional[datetime] = None) -> Tuple[float, float, float]:
+    """
+    (forgetting risk, difficulty factor, importance factor): everything
+    compute_priority needs from a topic. Modes only differ in weights.
+    """
+    return (
+        1 - estimate_retrievability(topic, now),
+        topic.difficulty / 5,
+        topic.importance / 5,
+    )
 
-    retrievability = estimate_retrievability(topic)
-    forgetting_risk = 1 - retrievability  # 0 → remembered, 1 → forgotten
 
-    difficulty_factor = topic.difficulty / 5
-    importance_factor = topic.importance / 5
+def weighted_priority(weights: Dict[str, float], factors: Tuple[float, float, float]) -> float:
+    forgetting_risk, difficulty_factor, importance_factor = factors
 
     priority = (
         weights["time"] * forgetting_risk +
@@ -41,6 +68,68 @@ def compute_priority(topic, mode: Literal["balanced", "exam", "revision"] = "bal
 
     return round(priority, 4)
 
+
+OVERDUE_THRESHOLD = 0.75
+DUE_THRESHOLD = 0.4
+
+# Crossings further out than this are treated as never
+MAX_BUCKET_HORIZON_DAYS = 3650
+
+
+def bucket_from_priority(p: float) -> str:
+    if p >= OVERDUE_THRESHOLD:
+        return "overdue"
+    elif p >= DUE_THRESHOLD:
+        return "due"
+    else:
+        return "fresh"
+
+
+def next_bucket_change(topic, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    When the topic's bucket (balanced weighting, as in the unit-wise
+    views) next changes if it isn't revised, or None if it never will.
+
+    Priority only grows with whole days since last_revised, so buckets
+    only move up (fresh -> due -> overdue) and the change happens at
+    last_revised + D days for the smallest D that reaches the next
+    threshold. D is found by search rather than by inverting the decay
+    so that rounding in compute_priority is matched exactly.
+    """
+    if not topic.last_revised:
+        return None
+
+    now = now or datetime.now(timezone.utc)
+    days = max((now - topic.last_revised).days, 0)
+    stability = estimate_stability(topic)
+
+    def priority_at(d: int) -> float:
+        return priority_from_retrievability(topic, math.exp(-d / stability))
+
+    current = priority_at(days)
+    if current >= OVERDUE_THRESHOLD:
+        return None
+    threshold = DUE_THRESHOLD if current < DUE_THRESHOLD else OVERDUE_THRESHOLD
+
+    # Gallop to a day at or past the threshold, then bisect
+    low, step = days, 1
+    high = low + step
+    while priority_at(high) < threshold:
+        if high - days > MAX_BUCKET_HORIZON_DAYS:
+            return None
+        low, step = high, step * 2
+        high = low + step
+
+    while high - low > 1:
+        mid = (low + high) // 2
+        if priority_at(mid) >= threshold:
+            high = mid
+        else:
+            low = mid
+
+    return topic.last_revised + timedelta(days=high)
+
+
 def build_revision_queue(topics, limit=15, mode="balanced"):
     scored = [(compute_priority(t, mode), t) for t in topics]
     scored.sort(key=lambda x: x[0], reverse=True)
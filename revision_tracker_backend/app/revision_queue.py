@@ -1,5 +1,8 @@
 # app/revision_queue.py
-from fastapi import APIRouter, Depends
+import heapq
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import aliased
@@ -7,26 +10,46 @@ from app.models import Topic, Revision
 
 from app.db import get_async_session
 from app.dependencies import get_current_user
-from app import models
-from app.revision_logic import compute_priority
+from app import models, read_models
+from app.jobs import accepted_job, submit_job
+from app.pagination import MAX_PAGE_SIZE
+from app.revision_logic import (
+    bucket_from_priority,
+    compute_priority,
+    priority_factors,
+    priority_modes,
+    weighted_priority,
+)
+from app.schemas import WhatIfQueueRequest
+from app.versioning import conditional_response, make_etag, scoring_day, scoring_time
+from app.responses import fast_json
 
 router = APIRouter(prefix="/revision-queue", tags=["revision"])
 
+Bucket = Literal["overdue", "due", "fresh"]
+
 @router.get("/")
 async def get_revision_queue(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_async_session),
     current_user: models.User = Depends(get_current_user)
 ):
-    stmt = select(models.Topic).where(models.Topic.user_id == current_user.id)
-    result = await session.execute(stmt)
-    topics = result.scalars().all()
+    etag = make_etag(current_user, current_user.priority_mode, scoring_day())
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
 
-    response = []
+    result = await session.execute(read_models.queue_topics(current_user.id))
+    topics = result.all()
+
+    now = scoring_time()
+    queue = []
 
     for topic in topics:
-        priority = compute_priority(topic, current_user.priority_mode)
+        priority = compute_priority(topic, current_user.priority_mode, now)
 
-        response.append({
+        queue.append({
             "id": topic.id,
             "subject": topic.subject,
             "unit": topic.unit,
@@ -35,22 +58,83 @@ async def get_revision_queue(
             "last_revised": topic.last_revised,
         })
 
-    response.sort(key=lambda t: t["priority"], reverse=True)
-    return response
-
-def bucket_from_priority(p: float) -> str:
-    if p >= 0.75:
-        return "overdue"
-    elif p >= 0.4:
-        return "due"
-    else:
-        return "fresh"
-    
-def compute_unit_progress(unit_buckets: dict) -> dict:
-    overdue = len(unit_buckets["overdue"])
-    due = len(unit_buckets["due"])
-    fresh = len(unit_buckets["fresh"])
+    queue.sort(key=lambda t: t["priority"], reverse=True)
+    return fast_json(queue, response)
+
+@router.post("/what-if")
+async def what_if_revision_queue(
+    payload: WhatIfQueueRequest,
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    """
+    Top k of the queue under several weightings at once: the built-in
+    priority modes and/or ad-hoc custom weights. Each topic's factors
+    are computed once and weighted per mode, keeping a k-sized heap per
+    mode, so comparing modes costs one scan instead of one per mode.
+    Priorities match GET /revision-queue/ under the same mode.
+    """
+    names = payload.modes if payload.modes is not None else list(priority_modes)
+
+    unknown = [name for name in names if name not in priority_modes]
+    if unknown:
+        raise HTTPException(400, f"Unknown priority modes: {', '.join(unknown)}")
+
+    clashing = [name for name in payload.custom if name in priority_modes]
+    if clashing:
+        raise HTTPException(400, f"Custom weights can't reuse mode names: {', '.join(clashing)}")
+
+    weightings = {name: priority_modes[name] for name in names}
+    for name, weights in payload.custom.items():
+        weightings[name] = weights.model_dump()
+
+    if not weightings:
+        raise HTTPException(400, "Nothing to compare")
+
+    result = await session.execute(read_models.queue_topics(user.id))
+    topics = result.all()
 
+    now = scoring_time()
+    k = payload.k
+    heaps = {name: [] for name in weightings}
+    scored = list(weightings.items())
+
+    for index, topic in enumerate(topics):
+        factors = priority_factors(topic, now)
+
+        for name, weights in scored:
+            # Min-heap of the k best (priority, id) so far; ties go to the
+            # larger id, as in the queue stream
+            entry = (weighted_priority(weights, factors), topic.id, index)
+            heap = heaps[name]
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    modes = {}
+    for name, weights in scored:
+        queue = []
+        for priority, _, index in sorted(heaps[name], reverse=True):
+            topic = topics[index]
+            queue.append({
+                "id": topic.id,
+                "subject": topic.subject,
+                "unit": topic.unit,
+                "name": topic.name,
+                "priority": priority,
+                "last_revised": topic.last_revised,
+            })
+        modes[name] = {"weights": weights, "queue": queue}
+
+    return fast_json({
+        "k": k,
+        "topics": len(topics),
+        "current_mode": user.priority_mode,
+        "modes": modes,
+    })
+
+def progress_from_counts(overdue: int, due: int, fresh: int) -> dict:
     total = overdue + due + fresh
     progress = (fresh / total) if total > 0 else 0.0
 
@@ -62,6 +146,23 @@ def compute_unit_progress(unit_buckets: dict) -> dict:
         "progress": round(progress, 2)
     }
 
+def compute_unit_progress(unit_buckets: dict) -> dict:
+    return progress_from_counts(
+        len(unit_buckets["overdue"]),
+        len(unit_buckets["due"]),
+        len(unit_buckets["fresh"]),
+    )
+
+def bucket_topic(topic, priority: float) -> dict:
+    return {
+        "id": topic.id,
+        "name": topic.name,
+        "priority": priority,
+        "difficulty": topic.difficulty,
+        "importance": topic.importance,
+        "last_revised": topic.last_revised,
+    }
+
 def compute_subject_progress(units: dict) -> dict:
     total = overdue = due = fresh = 0
 
@@ -86,21 +187,45 @@ def compute_subject_progress(units: dict) -> dict:
 
 @router.get("/unit-wise")
 async def unit_wise_revision_queue(
+    request: Request,
+    response: Response,
+    summary: bool = False,
     session: AsyncSession = Depends(get_async_session),
     user=Depends(get_current_user),
 ):
-    stmt = (
-        select(models.Topic)
-        .where(models.Topic.user_id == user.id)
+    """
+    Topics grouped by subject, unit and bucket, with progress counts.
+    With ?summary=true only the counts are returned (no "buckets"), read
+    from the persisted counters in app/progress.py; the topics of one
+    bucket can then be fetched from /unit-wise/{subject}/{unit}/{bucket}.
+    """
+    not_modified = conditional_response(
+        request, response, make_etag(user, scoring_day())
     )
+    if not_modified:
+        return not_modified
+
+    if summary:
+        result = await session.execute(read_models.unit_progress(user.id))
 
-    result = await session.execute(stmt)
-    topics = result.scalars().all()
+        overview = {}
+        for row in result.all():
+            overview.setdefault(row.subject, {})[row.unit] = {
+                "progress": progress_from_counts(row.overdue, row.due, row.fresh)
+            }
+        for units in overview.values():
+            units["_meta"] = compute_subject_progress(units)
 
+        return fast_json(overview, response)
+
+    result = await session.execute(read_models.queue_topics(user.id))
+    topics = result.all()
+
+    now = scoring_time()
     queue = {}
 
     for topic in topics:
-        priority = compute_priority(topic)
+        priority = compute_priority(topic, now=now)
 
         subject = topic.subject
         unit = topic.unit
@@ -116,14 +241,9 @@ async def unit_wise_revision_queue(
             "progress": {}
         })
 
-        queue[subject][unit]["buckets"][bucket].append({
-            "id": topic.id,
-            "name": topic.name,
-            "priority": priority,
-            "difficulty": topic.difficulty,
-            "importance": topic.importance,
-            "last_revised": topic.last_revised,
-        })
+        queue[subject][unit]["buckets"][bucket].append(
+            bucket_topic(topic, priority)
+        )
 
     # Sort topics INSIDE each bucket
     for subject in queue:
@@ -147,4 +267,61 @@ async def unit_wise_revision_queue(
 
 
 
-    return queue
+    return fast_json(queue, response)
+
+
+@router.post("/unit-wise/rebuild")
+async def rebuild_unit_progress(
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    """
+    Recount the unit-wise progress counters from scratch as a background
+    job; answers 202 with the job to poll at /jobs/{id}.
+    """
+    job = await submit_job(session, "progress_rebuild", user_id=user.id, unique=True)
+    return await accepted_job(session, job)
+
+
+@router.get("/unit-wise/{subject}/{unit}/{bucket}")
+async def unit_bucket_topics(
+    subject: str,
+    unit: str,
+    bucket: Bucket,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    """
+    Topics of one unit-wise bucket, highest priority first. count is the
+    size of the whole bucket even when limit truncates topics.
+    """
+    not_modified = conditional_response(
+        request, response, make_etag(user, scoring_day())
+    )
+    if not_modified:
+        return not_modified
+
+    result = await session.execute(
+        read_models.unit_queue_topics(user.id, subject, unit)
+    )
+
+    now = scoring_time()
+    topics = []
+
+    for topic in result.all():
+        priority = compute_priority(topic, now=now)
+        if bucket_from_priority(priority) == bucket:
+            topics.append(bucket_topic(topic, priority))
+
+    topics.sort(key=lambda t: t["priority"], reverse=True)
+
+    return fast_json({
+        "subject": subject,
+        "unit": unit,
+        "bucket": bucket,
+        "count": len(topics),
+        "topics": topics[:limit] if limit else topics,
+    }, response)
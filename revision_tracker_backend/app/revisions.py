@@ -1,17 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, insert, case, or_, func
 
 from app.db import get_async_session
 from app.dependencies import get_current_user
-from app import models
-from app.schemas import RevisionCreate
-from app.revision_logic import priority_modes, compute_priority
+from app import models, read_models
+from app.schemas import RevisionCreate, RevisionBatchItem
+from app.revision_logic import priority_modes
+from app.versioning import bump_data_version
+from app.progress import refresh_progress
+from app.jobs import accepted_job, submit_job
+from app.unit_ops import (
+    count_unit_topics,
+    mark_unit_topics,
+    progress_stream,
+    run_to_completion,
+)
 from datetime import datetime, timedelta, timezone
 
 DAILY_REVISION_GOAL = 5
 NEGLECT_WEIGHT = 10.0
+MAX_REVISION_BATCH = 1000
 
 
 router = APIRouter(prefix="/revisions", tags=["revisions"])
@@ -44,10 +54,103 @@ async def add_revision(
     topic.last_revised = datetime.now(timezone.utc)
 
     session.add(revision)
+    await bump_data_version(session, user.id)
+    await refresh_progress(session, user.id, models.Topic.id == topic.id)
     await session.commit()
 
     return {"success": True}
 
+@router.post("/batch")
+async def add_revisions_batch(
+    items: list[RevisionBatchItem],
+    session: AsyncSession = Depends(get_async_session),
+    user: models.User = Depends(get_current_user),
+):
+    if len(items) > MAX_REVISION_BATCH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_REVISION_BATCH} revisions per batch",
+        )
+
+    # Ownership check for every topic in one query
+    topic_ids = {item.topic_id for item in items}
+    owned = set()
+    if topic_ids:
+        result = await session.execute(
+            select(models.Topic.id).where(
+                models.Topic.user_id == user.id,
+                models.Topic.id.in_(topic_ids),
+            )
+        )
+        owned = set(result.scalars().all())
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    results = []
+
+    for index, item in enumerate(items):
+        revised_at = item.revised_at or now
+        if revised_at.tzinfo is None:
+            revised_at = revised_at.replace(tzinfo=timezone.utc)
+
+        if item.topic_id not in owned:
+            status = "not_found"
+        elif revised_at > now:
+            status = "rejected_future"
+        else:
+            status = "created"
+            rows.append({
+                "topic_id": item.topic_id,
+                "confidence": item.confidence,
+                "revised_at": revised_at,
+            })
+
+        results.append({
+            "index": index,
+            "topic_id": item.topic_id,
+            "status": status,
+        })
+
+    if rows:
+        revised_ids = {row["topic_id"] for row in rows}
+        await session.execute(insert(models.Revision), rows)
+
+        # Move last_revised forward to the newest revision per topic,
+        # never backwards past a later mark/revision already recorded
+        latest = (
+            select(func.max(models.Revision.revised_at))
+            .where(models.Revision.topic_id == models.Topic.id)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(models.Topic)
+            .where(
+                models.Topic.user_id == user.id,
+                models.Topic.id.in_(revised_ids),
+            )
+            .values(last_revised=case(
+                (
+                    or_(
+                        models.Topic.last_revised.is_(None),
+                        models.Topic.last_revised < latest,
+                    ),
+                    latest,
+                ),
+                else_=models.Topic.last_revised,
+            ))
+            .execution_options(synchronize_session=False)
+        )
+
+        await bump_data_version(session, user.id)
+        await refresh_progress(session, user.id, models.Topic.id.in_(revised_ids))
+        await session.commit()
+
+    return {
+        "created": len(rows),
+        "failed": len(items) - len(rows),
+        "results": results,
+    }
+
 @router.post("/{topic_id}/mark")
 async def mark_topic_revised(
     topic_id: str,
@@ -74,6 +177,8 @@ async def mark_topic_revised(
     if hasattr(topic, "times_revised") and topic.times_revised is not None:
         topic.times_revised += 1
 
+    await bump_data_version(session, user.id)
+    await refresh_progress(session, user.id, models.Topic.id == topic.id)
     await session.commit()
 
     return {
@@ -86,35 +191,52 @@ async def mark_topic_revised(
 async def mark_unit_revised(
     unit: str,
     subject: str,
+    stream: bool = False,
+    background: bool = False,
     session: AsyncSession = Depends(get_async_session),
     user=Depends(get_current_user),
 ):
-    stmt = (
-        update(models.Topic)
-        .where(
-            models.Topic.user_id == user.id,
-            models.Topic.subject == subject,
-            models.Topic.unit == unit,
-        )
-        .values(last_revised=datetime.now(timezone.utc))
-    )
-
-    result = await session.execute(stmt)
-    await session.commit()
-
-    if result.rowcount == 0:
+    """
+    Mark every topic in the unit revised now, in chunks (see
+    app/unit_ops.py). ?stream=true reports progress as NDJSON;
+    ?background=true runs it as a job (202, poll /jobs/{id}).
+    """
+    total = await count_unit_topics(session, user.id, subject, unit)
+    if total == 0:
         raise HTTPException(
             status_code=404,
             detail="No topics found for this unit",
         )
 
-    return {
+    revised_at = datetime.now(timezone.utc)
+    summary = {
         "subject": subject,
         "unit": unit,
-        "updated_topics": result.rowcount,
-        "last_revised": datetime.utcnow(),
+        "last_revised": revised_at,
     }
 
+    if background:
+        job = await submit_job(session, "unit_mark", {
+            "subject": subject,
+            "unit": unit,
+            "revised_at": revised_at.isoformat(),
+        }, user_id=user.id)
+        return await accepted_job(session, job)
+
+    if stream:
+        await session.close()
+        return progress_stream(
+            lambda s: mark_unit_topics(s, user.id, subject, unit, revised_at),
+            total,
+            "updated_topics",
+            summary,
+        )
+
+    updated = await run_to_completion(
+        mark_unit_topics(session, user.id, subject, unit, revised_at)
+    )
+    return {**summary, "updated_topics": updated}
+
 def is_today(dt: datetime) -> bool:
     if not dt:
         return False
@@ -318,31 +440,14 @@ async def adaptive_daily_goal_per_subject(
     session: AsyncSession = Depends(get_async_session),
     user=Depends(get_current_user),
 ):
-    # 1) Build subject -> backlog from current buckets
-    # Reuse your unit-wise queue builder logic OR query directly
-    stmt = select(
-        models.Topic.subject,
-        models.Topic.last_revised
-    ).where(models.Topic.user_id == user.id)
-
-    rows = (await session.execute(stmt)).all()
+    # 1) Build subject -> backlog from the persisted unit counters
+    rows = (await session.execute(read_models.unit_progress(user.id))).all()
 
-    # Count backlog by subject using priority buckets
     backlog = {}  # subject -> {overdue, due}
-    for subject, last_revised in rows:
-        # compute priority the same way you do in the queue
-        topic = models.Topic(subject=subject, last_revised=last_revised)
-        p = compute_priority(topic)
-
-        bucket = "fresh"
-        if p >= 0.75:
-            bucket = "overdue"
-        elif p >= 0.4:
-            bucket = "due"
-
-        backlog.setdefault(subject, {"overdue": 0, "due": 0})
-        if bucket in ("overdue", "due"):
-            backlog[subject][bucket] += 1
+    for unit in rows:
+        counts = backlog.setdefault(unit.subject, {"overdue": 0, "due": 0})
+        counts["overdue"] += unit.overdue
+        counts["due"] += unit.due
 
     # 2) Weekly shares (reuse logic from subject-wise weekly summary)
     now = datetime.now(timezone.utc)
@@ -479,6 +584,7 @@ async def set_priority_mode(
         raise HTTPException(400, "Invalid priority mode")
 
     user.priority_mode = payload.mode
+    await bump_data_version(session, user.id)
     await session.commit()
 
     return {
@@ -36,13 +36,59 @@ class TopicRead(BaseModel):
     class Config:
         from_attributes = True
 
+# Ids per PATCH /topics/bulk; each one is a bind parameter
+MAX_BULK_TOPIC_IDS = 1000
+
+class TopicBulkUpdate(BaseModel):
+    # Target topics: explicit ids, or every topic in a subject (and unit)
+    topic_ids: Optional[list[UUID]] = Field(default=None, max_length=MAX_BULK_TOPIC_IDS)
+    subject: Optional[str] = None
+    unit: Optional[str] = None
+
+    # Changes to apply
+    difficulty: Optional[int] = Field(default=None, ge=1, le=5)
+    importance: Optional[int] = Field(default=None, ge=1, le=5)
+    new_unit: Optional[str] = None
+
 class RevisionCreate(BaseModel):
     topic_id: UUID
     confidence: int = Field(ge=1, le=5)
 
+class RevisionBatchItem(BaseModel):
+    topic_id: UUID
+    confidence: int = Field(ge=1, le=5)
+    revised_at: Optional[datetime] = None  # defaults to time of sync
+
+class PriorityWeights(BaseModel):
+    time: float = Field(ge=0)
+    difficulty: float = Field(ge=0)
+    importance: float = Field(ge=0)
+
+class WhatIfQueueRequest(BaseModel):
+    k: int = Field(default=20, ge=1, le=100)
+    # Built-in modes to include (default: all of priority_modes)
+    modes: Optional[list[str]] = None
+    # Ad-hoc weightings by name, scored alongside the modes
+    custom: dict[str, PriorityWeights] = Field(default_factory=dict, max_length=5)
+
 class SyllabusParseRequest(BaseModel):
     text: str
 
+class SyllabusDocument(BaseModel):
+    name: Optional[str] = None
+    text: str
+
+class SyllabusBatchParseRequest(BaseModel):
+    documents: list[SyllabusDocument]
+
+class SyllabusImportRequest(BaseModel):
+    text: str
+    dry_run: bool = False
+
+class SyllabusNearDuplicateRequest(BaseModel):
+    text: str
+    threshold: float = Field(default=0.5, ge=0.1, le=1.0)
+
 class TopicBulkCreate(BaseModel):
     subject: str
     unit: Optional[str] = None
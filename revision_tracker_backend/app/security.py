@@ -1,5 +1,4 @@
 # app/security.py
-import bcrypt
 
 # Bcrypt has a 72-byte limit
 BCRYPT_MAX_LENGTH = 72
@@ -20,6 +19,8 @@ def hash_password(password: str) -> str:
     """
     Hash a plain text password using bcrypt directly.
     """
+    import bcrypt
+
     password_bytes = _truncate_password(password)
     # gensalt() generates a salt, hashpw() hashes the password with the salt
     hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
@@ -29,10 +30,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password using bcrypt directly.
     """
+    import bcrypt
+
     try:
         password_bytes = _truncate_password(plain_password)
         hashed_bytes = hashed_password.encode('utf-8')
         return bcrypt.checkpw(password_bytes, hashed_bytes)
-    except Exception as e:
-        print(f"Password verification error: {e}")
+    except Exception:
+        # A malformed stored hash; treat it as a wrong password
         return False
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, distinct
+from typing import Optional
+from uuid import UUID
 from app.db import get_async_session
 from app.dependencies import get_current_user
-from app import models
+from app import models, read_models
+from app.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_page, split_page
+from app.responses import fast_json
+from app.versioning import conditional_response, make_etag
 
 router = APIRouter(prefix="/subjects", tags=["subjects"])
 
@@ -51,28 +56,31 @@ async def list_units(
 async def list_topics(
     subject: str,
     unit: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     session: AsyncSession = Depends(get_async_session),
     user=Depends(get_current_user),
 ):
-    stmt = (
-        select(models.Topic)
-        .where(
-            models.Topic.user_id == user.id,
-            models.Topic.subject == subject,
-            models.Topic.unit == unit,
-        )
+    not_modified = conditional_response(request, response, make_etag(user))
+    if not_modified:
+        return not_modified
+
+    stmt = keyset_page(
+        read_models.unit_topics(user.id, subject, unit),
+        (models.Topic.name, models.Topic.id),
+        (str, UUID),
+        cursor=cursor,
+        limit=limit,
     )
 
     result = await session.execute(stmt)
-    topics = result.scalars().all()
+    rows, next_cursor = split_page(
+        result.all(), limit, lambda t: (t.name, t.id)
+    )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
-    return [
-        {
-            "id": t.id,
-            "name": t.name,
-            "difficulty": t.difficulty,
-            "importance": t.importance,
-            "last_revised": t.last_revised,
-        }
-        for t in topics
-    ]
+    return fast_json([row._asdict() for row in rows], response)
@@ -1,20 +1,48 @@
 # app/syllabus.py
-from fastapi import APIRouter, Depends
+import asyncio
+import codecs
+from typing import AsyncIterator, List
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
+from sqlalchemy import String, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+import config
+from app.db import get_async_session
 from app.dependencies import get_current_user
-from app.schemas import SyllabusParseRequest
-from app.syllabus_parser import parse_syllabus, flatten_syllabus
+from app import models
+from app.responses import PrimedStreamingResponse
+from app.schemas import (
+    SyllabusBatchParseRequest,
+    SyllabusImportRequest,
+    SyllabusNearDuplicateRequest,
+    SyllabusParseRequest,
+)
+from app.near_duplicates import find_near_duplicates
+from app.syllabus_parser import (
+    SyllabusTokenizer,
+    TopicFlattener,
+    merge_flat_topics,
+)
+from app.parse_pool import check_document_size, parse_syllabus_text, run_in_pool
+from app.versioning import bump_data_version
+from app.progress import refresh_progress
+from app.jobs import accepted_job, job_handler, submit_job
 
 router = APIRouter(prefix="/syllabus", tags=["syllabus"])
 
+MAX_BATCH_DOCUMENTS = 100
+
 @router.post("/parse")
 async def parse_syllabus_preview(
     payload: SyllabusParseRequest,
     user=Depends(get_current_user),
 ):
-    parsed = parse_syllabus(payload.text)
-    flat_topics = flatten_syllabus(parsed)
+    flat_topics = await parse_syllabus_text(payload.text)
 
     return {
         "count": len(flat_topics),
@@ -22,5 +50,351 @@ async def parse_syllabus_preview(
     }
 
 
+@router.post("/parse/batch")
+async def parse_syllabus_batch(
+    payload: SyllabusBatchParseRequest,
+    user=Depends(get_current_user),
+):
+    documents = payload.documents
+    if len(documents) > MAX_BATCH_DOCUMENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BATCH_DOCUMENTS} documents per batch",
+        )
+
+    # Refuse an oversized batch before parsing any of it
+    for doc in documents:
+        check_document_size(doc.text)
+    total_chars = sum(len(doc.text) for doc in documents)
+    if total_chars > config.SYLLABUS_MAX_BATCH_CHARS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {config.SYLLABUS_MAX_BATCH_CHARS} characters per batch",
+        )
+
+    # When the batch as a whole is too big to parse inline, every
+    # document goes to the pool so they run in parallel across workers.
+    inline_max_chars = None
+    if total_chars > config.PARSE_INLINE_MAX_CHARS:
+        inline_max_chars = 0
+
+    results = await asyncio.gather(*(
+        parse_syllabus_text(doc.text, inline_max_chars)
+        for doc in documents
+    ))
+
+    merged, contributed = merge_flat_topics(results)
+
+    stats = []
+    for index, (doc, flat, added) in enumerate(zip(documents, results, contributed)):
+        stats.append({
+            "index": index,
+            "name": doc.name,
+            "characters": len(doc.text),
+            "topics": len(flat),
+            "subjects": len({t["subject"] for t in flat}),
+            "units": len({(t["subject"], t["unit"]) for t in flat}),
+            "new_topics": added,
+            "duplicate_topics": len(flat) - added,
+        })
+
+    return {
+        "documents": stats,
+        "count": len(merged),
+        "topics": merged,
+    }
+
+
+def _line_too_long() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Lines are limited to {config.SYLLABUS_MAX_LINE_CHARS} characters",
+    )
+
+
+async def iter_text_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+    """
+    Decode a UTF-8 byte stream and yield the complete lines in each chunk,
+    split exactly as str.splitlines() would split the whole text. Only the
+    trailing partial line is carried between chunks, as a list of pieces
+    joined once the line ends; a line longer than SYLLABUS_MAX_LINE_CHARS
+    raises 413.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    max_chars = config.SYLLABUS_MAX_LINE_CHARS
+    pieces: List[str] = []
+    pending_chars = 0
+    # The last line ended in "\r", which may be the first half of "\r\n"
+    after_cr = False
+
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if not text:
+            continue
+        if after_cr and text[0] == "\n":
+            text = text[1:]
+        after_cr = False
+
+        lines = []
+        for part in text.splitlines(keepends=True):
+            line = part.splitlines()[0]
+            if pending_chars + len(line) > max_chars:
+                raise _line_too_long()
+
+            if len(line) == len(part):
+                # No line break: only ever the last part
+                pieces.append(line)
+                pending_chars += len(line)
+                after_cr = False
+                break
+
+            if pieces:
+                pieces.append(line)
+                line = "".join(pieces)
+                pieces.clear()
+                pending_chars = 0
+            lines.append(line)
+            after_cr = part.endswith("\r")
+
+        if lines:
+            yield lines
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        pieces.append(tail)
+    if pieces:
+        text = "".join(pieces)
+        if len(text) > max_chars:
+            raise _line_too_long()
+        yield text.splitlines()
+
+
+@router.post("/parse/stream")
+async def parse_syllabus_stream(
+    request: Request,
+    user=Depends(get_current_user),
+):
+    """
+    Parse a syllabus sent as the raw request body (plain text) and stream
+    the flattened topics back as NDJSON, one topic per line, as soon as
+    they are recognized. The document is never held in memory.
+
+    A line over SYLLABUS_MAX_LINE_CHARS is refused with 413 if no topic
+    has been sent yet; otherwise the stream ends with an {"error": ...}
+    line.
+    """
+    async def ndjson():
+        tokenizer = SyllabusTokenizer()
+        flattener = TopicFlattener()
+        sent = False
+
+        try:
+            async for lines in iter_text_lines(request.stream()):
+                out = []
+                for line in lines:
+                    for topic in flattener.feed(tokenizer.feed(line)):
+                        out.append(orjson.dumps(topic))
+                if out:
+                    sent = True
+                    yield b"\n".join(out) + b"\n"
+        except HTTPException as e:
+            if not sent:
+                raise
+            yield orjson.dumps({"error": e.detail}) + b"\n"
+
+    return PrimedStreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.post("/near-duplicates")
+async def find_syllabus_near_duplicates(
+    payload: SyllabusNearDuplicateRequest,
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    """
+    Report likely duplicate topics before an import: pairs of parsed
+    topics, or a parsed topic and an existing one, whose names are
+    similar but not identical ("Binary search trees" and "Binary Search
+    Tree (BST)"). Exact matches are already handled by the import diff.
+    """
+    flat_topics = await parse_syllabus_text(payload.text)
 
+    result = await session.execute(
+        select(models.Topic.id, models.Topic.subject, models.Topic.name)
+        .where(models.Topic.user_id == user.id)
+    )
+    existing = result.all()
+
+    incoming_names = [t["name"] for t in flat_topics]
+    existing_names = [row.name for row in existing]
+
+    if len(incoming_names) + len(existing_names) > config.NEAR_DUPLICATE_INLINE_MAX_NAMES:
+        pairs = await run_in_pool(
+            find_near_duplicates,
+            incoming_names,
+            existing_names,
+            payload.threshold,
+            action="Near-duplicate check",
+        )
+    else:
+        pairs = find_near_duplicates(incoming_names, existing_names, payload.threshold)
+
+    n_incoming = len(flat_topics)
+    candidates = []
+
+    for i, j, similarity in pairs:
+        topic = flat_topics[i]
+        if j < n_incoming:
+            match = {"source": "syllabus", **flat_topics[j]}
+        else:
+            row = existing[j - n_incoming]
+            match = {
+                "source": "existing",
+                "id": row.id,
+                "subject": row.subject,
+                "name": row.name,
+            }
+
+        candidates.append({
+            "similarity": similarity,
+            "topic": topic,
+            "match": match,
+        })
+
+    return {
+        "parsed": n_incoming,
+        "existing": len(existing),
+        "threshold": payload.threshold,
+        "count": len(candidates),
+        "candidates": candidates,
+    }
+
+
+async def diff_against_existing(
+    session: AsyncSession,
+    user_id,
+    flat_topics: List[dict],
+) -> dict:
+    """
+    Split parsed topics into new, already-present and conflicting ones
+    with a single lookup of the user's topics by name.
+
+    Topic names are unique per user (uq_user_topic), so a name that
+    already exists, or repeats within the document, under a different
+    subject is a conflict rather than something we can insert.
+    """
+    if not flat_topics:
+        return {"create": [], "existing": [], "conflicts": []}
+
+    # One array parameter however many names there are; IN would bind
+    # one each and a large syllabus would exceed asyncpg's limit
+    names = sorted({t["name"].lower() for t in flat_topics})
+    result = await session.execute(
+        select(models.Topic.subject, models.Topic.name).where(
+            models.Topic.user_id == user_id,
+            func.lower(models.Topic.name) == any_(
+                bindparam("names", names, type_=ARRAY(String))
+            ),
+        )
+    )
+    taken = {name.lower(): subject for subject, name in result.all()}
+
+    create, existing, conflicts = [], [], []
+
+    for topic in flat_topics:
+        name_key = topic["name"].lower()
+        owner = taken.get(name_key)
+
+        if owner is None:
+            taken[name_key] = topic["subject"]
+            create.append(topic)
+        elif owner.lower() == topic["subject"].lower():
+            existing.append(topic)
+        else:
+            conflicts.append({**topic, "existing_subject": owner})
+
+    return {"create": create, "existing": existing, "conflicts": conflicts}
+
+
+async def import_syllabus_text(
+    session: AsyncSession,
+    user_id,
+    text: str,
+    dry_run: bool = False,
+) -> dict:
+    flat_topics = await parse_syllabus_text(text)
+    diff = await diff_against_existing(session, user_id, flat_topics)
+
+    summary = {
+        "parsed": len(flat_topics),
+        "to_create": len(diff["create"]),
+        "existing": len(diff["existing"]),
+        "conflicts": len(diff["conflicts"]),
+    }
+
+    if dry_run:
+        return {**summary, "dry_run": True, "diff": diff}
+
+    created = 0
+    if diff["create"]:
+        stmt = (
+            pg_insert(models.Topic)
+            .on_conflict_do_nothing(constraint="uq_user_topic")
+            .returning(models.Topic.id)
+        )
+        result = await session.execute(stmt, [
+            {**topic, "user_id": user_id} for topic in diff["create"]
+        ])
+        created_ids = result.scalars().all()
+        created = len(created_ids)
+
+        await bump_data_version(session, user_id)
+        if created_ids:
+            await refresh_progress(
+                session,
+                user_id,
+                models.Topic.id == any_(
+                    bindparam("ids", created_ids, type_=ARRAY(UUID(as_uuid=True)))
+                ),
+            )
+        await session.commit()
+
+    return {
+        **summary,
+        "dry_run": False,
+        "created": created,
+        "existing_topics": diff["existing"],
+        "conflict_topics": diff["conflicts"],
+    }
+
+
+# Re-running after a partial attempt is safe: topics already imported
+# show up as existing in the diff
+@job_handler("syllabus_import", concurrency=config.PARSE_MAX_CONCURRENCY)
+async def _import_syllabus_job(session: AsyncSession, job: models.Job) -> dict:
+    return await import_syllabus_text(
+        session, job.user_id, job.params["text"], job.params["dry_run"]
+    )
+
+
+@router.post("/import")
+async def import_syllabus(
+    payload: SyllabusImportRequest,
+    background: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    """
+    Import the syllabus's new topics. With ?background=true the import
+    runs as a job: 202 with the job to poll at /jobs/{id}, whose result
+    is the usual response.
+    """
+    if background:
+        check_document_size(payload.text)
+        job = await submit_job(session, "syllabus_import", {
+            "text": payload.text,
+            "dry_run": payload.dry_run,
+        }, user_id=user.id)
+        return await accepted_job(session, job)
 
+    return await import_syllabus_text(session, user.id, payload.text, payload.dry_run)
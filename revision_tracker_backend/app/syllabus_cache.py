@@ -0,0 +1,226 @@
+# app/syllabus_cache.py
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+import config
+from app.syllabus_parser import flatten_syllabus, normalize, parse_syllabus
+
+# Prune the disk tier every this many writes rather than on each one
+DISK_PRUNE_INTERVAL = 32
+
+
+def content_key(text: str) -> str:
+    """
+    Hash of the text as the parser sees it: normalized, non-empty lines.
+    Documents that differ only in whitespace or blank lines share a key
+    because they parse identically.
+    """
+    digest = hashlib.sha256()
+    for raw in text.splitlines():
+        line = normalize(raw)
+        if line:
+            digest.update(line.encode("utf-8"))
+            digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class SyllabusCache:
+    """
+    LRU cache of flattened parse results keyed by content_key().
+
+    The memory tier holds up to max_entries results and up to max_bytes
+    of them, sizing each result by its JSON encoding (the Python objects
+    take a few times more); a result bigger than that on its own is not
+    kept in memory. If directory is set,
+    results are also written there as JSON files named by key. Workers on
+    the same host that point at the same directory share it, and it
+    survives restarts. Files are written atomically and the disk tier is
+    trimmed to max_disk_entries by modification time; reads touch the file.
+
+    Cached lists are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        directory: Optional[str] = None,
+        max_disk_entries: int = 4096,
+        max_bytes: int = 32 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_entries = max_disk_entries
+        self.directory = Path(directory) if directory else None
+        # key -> (flattened topics, approximate size in bytes)
+        self._entries: "OrderedDict[str, Tuple[List[Dict], int]]" = OrderedDict()
+        self._bytes = 0
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str, disk: bool = True) -> Optional[List[Dict]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        if not disk:
+            return None
+
+        data = self._read_disk(key)
+        if data is None:
+            return None
+
+        try:
+            flat = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return None
+        self.remember(key, flat, len(data))
+        return flat
+
+    def put(self, key: str, flat: List[Dict]) -> int:
+        data = orjson.dumps(flat)
+        self._write_disk(key, data)
+        return self.remember(key, flat, len(data))
+
+    def remember(self, key: str, flat: List[Dict], size: Optional[int] = None) -> int:
+        """
+        Store in the memory tier only. size is len(orjson.dumps(flat)),
+        computed if not given; it is returned so a caller storing the
+        same result under another key can pass it on.
+        """
+        if size is None:
+            size = len(orjson.dumps(flat))
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        if size > self.max_bytes:
+            return size
+
+        self._entries[key] = (flat, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+        return size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return None
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        if not self.directory:
+            return
+
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"Syllabus cache write error: {e}")
+            return
+
+        self._writes += 1
+        if self._writes % DISK_PRUNE_INTERVAL == 0:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        try:
+            files = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(".json")
+            ]
+        except OSError:
+            return
+
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return
+
+        files.sort()
+        for _, path in files[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                # Another worker got there first
+                pass
+
+
+syllabus_cache = SyllabusCache(
+    max_entries=config.SYLLABUS_CACHE_SIZE,
+    directory=config.SYLLABUS_CACHE_DIR,
+    max_disk_entries=config.SYLLABUS_CACHE_DISK_ENTRIES,
+    max_bytes=config.SYLLABUS_CACHE_MAX_BYTES,
+)
+
+
+def raw_key(text: str) -> str:
+    return "raw-" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def parse_and_flatten(text: str) -> List[Dict]:
+    """
+    flatten_syllabus(parse_syllabus(text)), served from the cache when
+    the same content has been parsed before.
+
+    Byte-identical pastes are found by a plain hash of the raw text,
+    which skips normalization; only those aliases stay in memory, the
+    disk tier is keyed by content_key() alone.
+    """
+    exact = raw_key(text)
+    flat = syllabus_cache.get(exact, disk=False)
+    if flat is not None:
+        syllabus_cache.hits += 1
+        return flat
+
+    key = content_key(text)
+    flat = syllabus_cache.get(key)
+    size = None
+    if flat is not None:
+        syllabus_cache.hits += 1
+    else:
+        syllabus_cache.misses += 1
+        flat = flatten_syllabus(parse_syllabus(text))
+        size = syllabus_cache.put(key, flat)
+
+    syllabus_cache.remember(exact, flat, size)
+    return flat
+
+
+def parse_keyed(text: str) -> Tuple[str, List[Dict]]:
+    """
+    (content_key(text), flattened syllabus) for the process pool's
+    workers, which have their own memory tier and share the disk tier
+    (if configured) with every other process on the host. It lives here
+    rather than in parse_pool so a spawned worker only imports the
+    parser and this cache, not FastAPI.
+    """
+    key = content_key(text)
+    flat = syllabus_cache.get(key)
+    if flat is None:
+        flat = flatten_syllabus(parse_syllabus(text))
+        syllabus_cache.put(key, flat)
+    return key, flat
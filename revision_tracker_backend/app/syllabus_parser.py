@@ -1,30 +1,60 @@
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 MAX_TOPIC_LENGTH = 120
+MAX_SUBJECT_LENGTH = 60
+MAX_SUBJECT_WORDS = 8
+
+# Compiled once at import. Every pattern below runs against a line that
+# has already been through normalize(), so the only whitespace left is
+# single ASCII spaces and there is none at either end.
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOPIC_SEPARATOR_RE = re.compile(r"[,;]")
+_BULLET_RE = re.compile(r"^[-•*]\s+")
+
+# Equivalent to matching r"^(unit|module|chapter)..." against line.lower().
+# Explicit case classes instead of re.IGNORECASE, which would also accept
+# characters like "ı" that str.lower() does not map to ASCII; "İ" is kept
+# in the numeral class because "İ".lower() starts with "i".
+_UNIT_RE = re.compile(
+    r"^(?:[uU][nN][iI][tT]|[mM][oO][dD][uU][lL][eE]|[cC][hH][aA][pP][tT][eE][rR])"
+    r"\s*[-:]?\s*(?:\d+|[ivxIVXİ]+)"
+)
+
+_BULLET_CHARS = "-•*"
 
 
 def normalize(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    return _WHITESPACE_RE.sub(" ", text).strip()
 
 
 def looks_like_unit(line: str) -> bool:
-    return bool(re.match(r"^(unit|module|chapter)\s*[-:]?\s*(\d+|[ivx]+)", line.lower()))
+    return _UNIT_RE.match(line) is not None
+
+
+def _subject_shaped(line: str) -> bool:
+    # Subject rules minus the unit check, for a normalized line
+    if len(line) > MAX_SUBJECT_LENGTH:
+        return False
+    if line.count(" ") >= MAX_SUBJECT_WORDS:
+        return False
+    # Subject usually not too short and not bullet-like
+    return line[0].isupper() and line[0] not in _BULLET_CHARS
 
 
 def looks_like_subject(line: str) -> bool:
-    if len(line) > 60:
+    if len(line) > MAX_SUBJECT_LENGTH:
         return False
     if looks_like_unit(line):
         return False
-    if len(line.split()) > 8:
+    if len(line.split()) > MAX_SUBJECT_WORDS:
         return False
     # Subject usually not too short and not bullet-like
-    return line[0].isupper() and not re.match(r"^[-•*]", line)
+    return line[0].isupper() and not line.startswith(tuple(_BULLET_CHARS))
 
 
 def looks_like_bullet(line: str) -> bool:
-    return bool(re.match(r"^[-•*]\s+", line))
+    return _BULLET_RE.match(line) is not None
 
 
 def is_valid_topic(line: str) -> bool:
@@ -33,90 +63,160 @@ def is_valid_topic(line: str) -> bool:
     return True
 
 
-def split_topics(text: str) -> List[str]:
-    parts = re.split(r",|;", text)
-    return [normalize(p) for p in parts if is_valid_topic(normalize(p))]
+def _split_normalized(text: str) -> List[str]:
+    # split_topics for text that is already normalized: stripping each
+    # part is all normalize() would still do.
+    topics = []
+    for part in _TOPIC_SEPARATOR_RE.split(text):
+        part = part.strip()
+        if is_valid_topic(part):
+            topics.append(part)
+    return topics
 
 
-class ParserState:
-    def __init__(self):
-        self.current_subject: Optional[Dict] = None
-        self.current_unit: Optional[Dict] = None
-        self.has_seen_unit = False
+def split_topics(text: str) -> List[str]:
+    return _split_normalized(normalize(text))
 
 
-def ensure_subject(state: ParserState, syllabus: List[Dict]):
-    if not state.current_subject:
-        state.current_subject = {"subject": "General", "units": []}
-        syllabus.append(state.current_subject)
+# Parser events: (kind, name)
+SUBJECT = "subject"
+UNIT = "unit"
+TOPIC = "topic"
 
+_NO_EVENTS: List[Tuple[str, str]] = []
 
-def ensure_unit(state: ParserState):
-    if not state.current_unit:
-        state.current_unit = {"unit": "Unit 1", "topics": []}
-        state.current_subject["units"].append(state.current_unit)
 
+class SyllabusTokenizer:
+    """
+    Incremental syllabus parser. feed() takes one raw line at a time and
+    returns the events it produces, so a document can be parsed as it
+    arrives without holding it in memory.
+    """
 
-def parse_syllabus(raw_text: str) -> List[Dict]:
-    lines = raw_text.splitlines()
-    syllabus: List[Dict] = []
-    state = ParserState()
+    def __init__(self):
+        self.has_subject = False
+        self.has_unit = False
+        self.has_seen_unit = False
 
-    for raw in lines:
+    def feed(self, raw: str) -> List[Tuple[str, str]]:
         line = normalize(raw)
         if not line:
-            continue
+            return _NO_EVENTS
+
+        # Classify each line once
+        is_unit = _UNIT_RE.match(line) is not None
 
         # ===== SUBJECT =====
-        if looks_like_subject(line) and not state.has_seen_unit:
-            state.current_subject = {"subject": line, "units": []}
-            syllabus.append(state.current_subject)
-            state.current_unit = None
-            continue
-
-        ensure_subject(state, syllabus)
-
-        # ===== UNIT (with inline topics) =====
-        if looks_like_unit(line) and ":" in line:
-            unit_part, topic_part = line.split(":", 1)
-            unit_name = normalize(unit_part)
-            topics = split_topics(topic_part)
-
-            state.current_unit = {"unit": unit_name, "topics": topics}
-            state.current_subject["units"].append(state.current_unit)
-            state.has_seen_unit = True
-            continue
-
-        # ===== UNIT (standalone) =====
-        if looks_like_unit(line):
-            state.current_unit = {"unit": line, "topics": []}
-            state.current_subject["units"].append(state.current_unit)
-            state.has_seen_unit = True
-            continue
+        if not self.has_seen_unit and not is_unit and _subject_shaped(line):
+            self.has_subject = True
+            self.has_unit = False
+            return [(SUBJECT, line)]
+
+        events = []
+        if not self.has_subject:
+            self.has_subject = True
+            events.append((SUBJECT, "General"))
+
+        if is_unit:
+            self.has_unit = True
+            self.has_seen_unit = True
+
+            # ===== UNIT (with inline topics) =====
+            if ":" in line:
+                unit_part, topic_part = line.split(":", 1)
+                events.append((UNIT, unit_part.strip()))
+                events.extend((TOPIC, t) for t in _split_normalized(topic_part))
+            # ===== UNIT (standalone) =====
+            else:
+                events.append((UNIT, line))
+            return events
 
         # ===== TOPICS =====
-        ensure_unit(state)
+        if not self.has_unit:
+            self.has_unit = True
+            events.append((UNIT, "Unit 1"))
 
-        # Bullet topics
-        if looks_like_bullet(line):
-            topic = normalize(re.sub(r"^[-•*]\s+", "", line))
+        # Bullet topics: a normalized bullet is "<marker> <topic>"
+        if line[0] in _BULLET_CHARS and line[1:2] == " ":
+            topic = line[2:]
             if is_valid_topic(topic):
-                state.current_unit["topics"].append(topic)
-            continue
+                events.append((TOPIC, topic))
+            return events
 
         # Comma-separated topics (only split if clearly multiple topics)
-        comma_topics = split_topics(line)
+        comma_topics = _split_normalized(line)
         if len(comma_topics) >= 3:
-            state.current_unit["topics"].extend(comma_topics)
-            continue
+            events.extend((TOPIC, t) for t in comma_topics)
+            return events
 
         # Plain topic
         if is_valid_topic(line):
-            state.current_unit["topics"].append(line)
+            events.append((TOPIC, line))
+        return events
+
+
+def iter_syllabus(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    tokenizer = SyllabusTokenizer()
+    for raw in lines:
+        yield from tokenizer.feed(raw)
+
+
+def parse_syllabus(raw_text: str) -> List[Dict]:
+    syllabus: List[Dict] = []
+    subject: Optional[Dict] = None
+    unit: Optional[Dict] = None
+
+    for kind, name in iter_syllabus(raw_text.splitlines()):
+        if kind == TOPIC:
+            unit["topics"].append(name)
+        elif kind == UNIT:
+            unit = {"unit": name, "topics": []}
+            subject["units"].append(unit)
+        else:
+            subject = {"subject": name, "units": []}
+            syllabus.append(subject)
 
     return syllabus
 
 
+def _flat_topic(subject: str, unit: str, name: str) -> Dict:
+    return {
+        "subject": subject,
+        "unit": unit,
+        "name": name,
+        "difficulty": 3,
+        "importance": 3,
+    }
+
+
+class TopicFlattener:
+    """
+    Streaming counterpart of flatten_syllabus: turns parser events into
+    flat topic dicts, dropping repeated (subject, topic) pairs. Memory
+    grows with the number of distinct topics, not document size.
+    """
+
+    def __init__(self):
+        self.seen = set()
+        self.subject: Optional[str] = None
+        self.unit: Optional[str] = None
+
+    def feed(self, events: Iterable[Tuple[str, str]]) -> List[Dict]:
+        flat = []
+        for kind, name in events:
+            if kind == TOPIC:
+                key = (self.subject.lower(), name.lower())
+                if key in self.seen:
+                    continue
+                self.seen.add(key)
+                flat.append(_flat_topic(self.subject, self.unit, name))
+            elif kind == UNIT:
+                self.unit = name
+            else:
+                self.subject = name
+        return flat
+
+
 def flatten_syllabus(parsed: List[Dict]) -> List[Dict]:
     flat = []
     seen = set()
@@ -133,12 +233,31 @@ def flatten_syllabus(parsed: List[Dict]) -> List[Dict]:
                     continue
 
                 seen.add(key)
-                flat.append({
-                    "subject": subject_name,
-                    "unit": unit_name,
-                    "name": topic,
-                    "difficulty": 3,
-                    "importance": 3,
-                })
+                flat.append(_flat_topic(subject_name, unit_name, topic))
 
     return flat
+
+
+def merge_flat_topics(flat_lists: List[List[Dict]]) -> Tuple[List[Dict], List[int]]:
+    """
+    Merge several flatten_syllabus results with the same (subject, topic)
+    deduplication, keeping the first occurrence in list order. Returns the
+    merged topics and how many each list contributed.
+    """
+    merged = []
+    contributed = []
+    seen = set()
+
+    for flat in flat_lists:
+        added = 0
+        for topic in flat:
+            key = (topic["subject"].lower(), topic["name"].lower())
+            if key in seen:
+                continue
+
+            seen.add(key)
+            merged.append(topic)
+            added += 1
+        contributed.append(added)
+
+    return merged, contributed
@@ -1,12 +1,19 @@
 # app/topics.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
 
 from app.db import get_async_session
 from app.dependencies import get_current_user
-from app import app, models
-from app.schemas import TopicBulkCreate, TopicCreate, TopicRead
+from app import models, read_models
+from app.schemas import TopicBulkCreate, TopicBulkUpdate, TopicCreate, TopicRead
+from app.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_page, split_page
+from app.responses import ModelJSONResponse, fast_json
+from app.versioning import bump_data_version, conditional_response, make_etag
+from app.progress import refresh_progress
 
 
 
@@ -29,6 +36,9 @@ async def create_topic(
     )
 
     session.add(topic)
+    await session.flush()
+    await bump_data_version(session, user.id)
+    await refresh_progress(session, user.id, models.Topic.id == topic.id)
     await session.commit()
     await session.refresh(topic)
 
@@ -36,13 +46,38 @@ async def create_topic(
 
 @router.get("/", response_model=list[TopicRead])
 async def get_topics(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     session: AsyncSession = Depends(get_async_session),
     user: models.User = Depends(get_current_user),
 ):
-    result = await session.execute(
-        select(models.Topic).where(models.Topic.user_id == user.id)
+    not_modified = conditional_response(request, response, make_etag(user))
+    if not_modified:
+        return not_modified
+
+    stmt = keyset_page(
+        read_models.user_topics(user.id),
+        (models.Topic.created_at, models.Topic.id),
+        (datetime.fromisoformat, UUID),
+        cursor=cursor,
+        limit=limit,
+    )
+
+    result = await session.execute(stmt)
+    rows, next_cursor = split_page(
+        result.all(), limit, lambda t: (t.created_at, t.id)
+    )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    # Rows come straight from NOT NULL columns, so TopicRead validation
+    # adds nothing here; it stays as response_model for the OpenAPI schema.
+    return fast_json(
+        [row._asdict() for row in rows], response, ModelJSONResponse
     )
-    return result.scalars().all()
 
 
 @router.post("/bulk")
@@ -65,8 +100,97 @@ async def bulk_create_topics(
         objects.append(obj)
 
     session.add_all(objects)
+    await session.flush()
+    await bump_data_version(session, user.id)
+    await refresh_progress(
+        session, user.id, models.Topic.id.in_([obj.id for obj in objects])
+    )
     await session.commit()
 
     return {
         "created": len(objects)
     }
+
+
+@router.patch("/bulk")
+async def bulk_update_topics(
+    payload: TopicBulkUpdate,
+    session: AsyncSession = Depends(get_async_session),
+    user=Depends(get_current_user),
+):
+    changes = payload.model_dump(
+        include={"difficulty", "importance", "new_unit"},
+        exclude_none=True,
+    )
+    if "new_unit" in changes:
+        changes["unit"] = changes.pop("new_unit")
+
+    if not changes:
+        raise HTTPException(
+            status_code=400,
+            detail="Nothing to update",
+        )
+
+    conditions = [models.Topic.user_id == user.id]
+
+    if payload.topic_ids is not None:
+        if payload.subject is not None or payload.unit is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="Provide topic_ids or a subject filter, not both",
+            )
+        conditions.append(models.Topic.id.in_(payload.topic_ids))
+        rescore = [models.Topic.id.in_(payload.topic_ids)]
+    elif payload.subject is not None:
+        conditions.append(models.Topic.subject == payload.subject)
+        if payload.unit is not None:
+            conditions.append(models.Topic.unit == payload.unit)
+
+        # A subject can hold more topics than fit in one IN list, so the
+        # updated topics are found again by where they are now
+        rescore = [models.Topic.subject == payload.subject]
+        if "unit" in changes:
+            rescore.append(models.Topic.unit == changes["unit"])
+        elif payload.unit is not None:
+            rescore.append(models.Topic.unit == payload.unit)
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide topic_ids or a subject filter",
+        )
+
+    # Units topics are moved out of need their counters recounted too
+    moved_from = []
+    if "unit" in changes:
+        result = await session.execute(
+            select(models.Topic.subject, models.Topic.unit)
+            .where(*conditions)
+            .distinct()
+        )
+        moved_from = [tuple(row) for row in result.all()]
+
+    stmt = (
+        update(models.Topic)
+        .where(*conditions)
+        .values(**changes)
+        .returning(models.Topic.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    result = await session.execute(stmt)
+    topic_ids = result.scalars().all()
+
+    await bump_data_version(session, user.id)
+    if topic_ids:
+        await refresh_progress(
+            session,
+            user.id,
+            *rescore,
+            units=moved_from,
+        )
+    await session.commit()
+
+    return {
+        "updated": len(topic_ids),
+        "changes": changes,
+    }
@@ -0,0 +1,215 @@
+# app/unit_ops.py
+"""
+Unit-wide writes (delete, rename, mark revised) in bounded chunks.
+
+Each chunk of at most UNIT_OP_CHUNK_SIZE topics is its own transaction,
+so row locks are only held for one chunk and revisions of other topics
+in the unit go through in between. Every chunk bumps the data version
+and adjusts the progress counters for exactly the topics it changed, so
+each commit leaves consistent data even if the operation stops early.
+
+The operations are async generators yielding the number of topics in
+each committed chunk. They can be run to completion in the request,
+streamed as NDJSON progress, or submitted as background jobs. Delete
+and rename pick up whatever is left in the unit and mark writes a fixed
+timestamp, so a retried job finishes what an earlier attempt started.
+"""
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict
+
+import orjson
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import config
+from app.db import AsyncSessionLocal
+from app.jobs import job_handler, report_job_progress
+from app.models import Job, Revision, Topic
+from app.progress import BUCKETS, apply_progress_deltas, rescore_topics
+from app.responses import BodyStreamingResponse
+from app.versioning import bump_data_version
+
+
+async def count_unit_topics(session: AsyncSession, user_id, subject: str, unit: str) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(Topic).where(
+            Topic.user_id == user_id,
+            Topic.subject == subject,
+            Topic.unit == unit,
+        )
+    )
+
+
+async def _lock_chunk(session: AsyncSession, user_id, subject: str, unit: str, after=None):
+    # Lock order everywhere is topic rows, then the user row
+    # (bump_data_version), then counters
+    stmt = select(Topic.id, Topic.bucket).where(
+        Topic.user_id == user_id,
+        Topic.subject == subject,
+        Topic.unit == unit,
+    )
+    if after is not None:
+        stmt = stmt.where(Topic.id > after)
+
+    stmt = stmt.order_by(Topic.id).limit(config.UNIT_OP_CHUNK_SIZE).with_for_update()
+    return (await session.execute(stmt)).all()
+
+
+def _bucket_counts(rows, sign: int) -> Dict[str, int]:
+    counts = dict.fromkeys(BUCKETS, 0)
+    for row in rows:
+        if row.bucket is not None:
+            counts[row.bucket] += sign
+    return counts
+
+
+async def delete_unit_topics(
+    session: AsyncSession, user_id, subject: str, unit: str
+) -> AsyncIterator[int]:
+    """Delete the unit's topics and their revisions."""
+    while True:
+        rows = await _lock_chunk(session, user_id, subject, unit)
+        if not rows:
+            return
+
+        ids = [row.id for row in rows]
+        await session.execute(delete(Revision).where(Revision.topic_id.in_(ids)))
+        await session.execute(delete(Topic).where(Topic.id.in_(ids)))
+
+        await bump_data_version(session, user_id)
+        await apply_progress_deltas(session, user_id, {
+            (subject, unit): _bucket_counts(rows, -1),
+        })
+        await session.commit()
+        yield len(ids)
+
+
+async def rename_unit_topics(
+    session: AsyncSession, user_id, subject: str, unit: str, new_unit: str
+) -> AsyncIterator[int]:
+    """Move the unit's topics to new_unit (merging if it exists)."""
+    if new_unit == unit:
+        return
+
+    while True:
+        rows = await _lock_chunk(session, user_id, subject, unit)
+        if not rows:
+            return
+
+        ids = [row.id for row in rows]
+        await session.execute(
+            update(Topic)
+            .where(Topic.id.in_(ids))
+            .values(unit=new_unit)
+            .execution_options(synchronize_session=False)
+        )
+
+        await bump_data_version(session, user_id)
+        await apply_progress_deltas(session, user_id, {
+            (subject, unit): _bucket_counts(rows, -1),
+            (subject, new_unit): _bucket_counts(rows, 1),
+        })
+        await session.commit()
+        yield len(ids)
+
+
+async def mark_unit_topics(
+    session: AsyncSession, user_id, subject: str, unit: str, revised_at: datetime
+) -> AsyncIterator[int]:
+    """Set last_revised on every topic in the unit."""
+    after = None
+    while True:
+        rows = await _lock_chunk(session, user_id, subject, unit, after)
+        if not rows:
+            return
+
+        ids = [row.id for row in rows]
+        after = ids[-1]
+        await session.execute(
+            update(Topic)
+            .where(Topic.id.in_(ids))
+            .values(last_revised=revised_at)
+            .execution_options(synchronize_session=False)
+        )
+
+        await bump_data_version(session, user_id)
+        deltas = await rescore_topics(session, user_id, Topic.id.in_(ids))
+        await apply_progress_deltas(session, user_id, deltas)
+        await session.commit()
+        yield len(ids)
+
+
+async def run_to_completion(chunks: AsyncIterator[int]) -> int:
+    done = 0
+    async for n in chunks:
+        done += n
+    return done
+
+
+def progress_stream(
+    operation: Callable[[AsyncSession], AsyncIterator[int]],
+    total: int,
+    done_key: str,
+    summary: dict,
+) -> BodyStreamingResponse:
+    """
+    Run operation in its own session and report progress as NDJSON:
+    {"done": n, "total": total} after each chunk, then summary with
+    done_key set to the final count. The operation runs to the end even
+    if the client stops reading.
+    """
+    async def ndjson():
+        done = 0
+        async with AsyncSessionLocal() as session:
+            async for n in operation(session):
+                done += n
+                yield orjson.dumps({"done": done, "total": total}) + b"\n"
+
+        yield orjson.dumps({**summary, done_key: done}, default=str) + b"\n"
+
+    return BodyStreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+async def _run_as_job(job: Job, chunks: AsyncIterator[int], total: int) -> int:
+    done = 0
+    async for n in chunks:
+        done += n
+        await report_job_progress(job, done, total)
+    return done
+
+
+@job_handler("unit_delete")
+async def _delete_unit_job(session: AsyncSession, job: Job) -> dict:
+    subject, unit = job.params["subject"], job.params["unit"]
+    total = await count_unit_topics(session, job.user_id, subject, unit)
+    deleted = await _run_as_job(
+        job, delete_unit_topics(session, job.user_id, subject, unit), total
+    )
+    return {"deleted": deleted, "unit": unit, "subject": subject}
+
+
+@job_handler("unit_rename")
+async def _rename_unit_job(session: AsyncSession, job: Job) -> dict:
+    subject, unit = job.params["subject"], job.params["unit"]
+    new_unit = job.params["new_unit"]
+    total = await count_unit_topics(session, job.user_id, subject, unit)
+    updated = await _run_as_job(
+        job, rename_unit_topics(session, job.user_id, subject, unit, new_unit), total
+    )
+    return {"updated": updated, "old_unit": unit, "new_unit": new_unit}
+
+
+@job_handler("unit_mark")
+async def _mark_unit_job(session: AsyncSession, job: Job) -> dict:
+    subject, unit = job.params["subject"], job.params["unit"]
+    revised_at = datetime.fromisoformat(job.params["revised_at"])
+    total = await count_unit_topics(session, job.user_id, subject, unit)
+    updated = await _run_as_job(
+        job, mark_unit_topics(session, job.user_id, subject, unit, revised_at), total
+    )
+    return {
+        "subject": subject,
+        "unit": unit,
+        "last_revised": revised_at.isoformat(),
+        "updated_topics": updated,
+    }
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, distinct
+from typing import Optional
+from uuid import UUID
 from app.db import get_async_session
 from app.dependencies import get_current_user
-from app import models
-from sqlalchemy import delete, update
+from app import models, read_models
+from app.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_page, split_page
+from app.responses import fast_json
+from app.versioning import conditional_response, make_etag
+from app.jobs import accepted_job, submit_job
+from app.unit_ops import (
+    count_unit_topics,
+    delete_unit_topics,
+    progress_stream,
+    rename_unit_topics,
+    run_to_completion,
+)
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/units", tags=["units"])
@@ -36,57 +48,72 @@ async def list_units(
 async def list_unit_topics(
     unit: str,
     subject: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     session: AsyncSession = Depends(get_async_session),
     user=Depends(get_current_user),
 ):
-    stmt = (
-        select(models.Topic)
-        .where(
-            models.Topic.user_id == user.id,
-            models.Topic.subject == subject,
-            models.Topic.unit == unit,
-        )
+    not_modified = conditional_response(request, response, make_etag(user))
+    if not_modified:
+        return not_modified
+
+    stmt = keyset_page(
+        read_models.unit_topics(user.id, subject, unit),
+        (models.Topic.name, models.Topic.id),
+        (str, UUID),
+        cursor=cursor,
+        limit=limit,
     )
 
     result = await session.execute(stmt)
-    topics = result.scalars().all()
+    rows, next_cursor = split_page(
+        result.all(), limit, lambda t: (t.name, t.id)
+    )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
-    return [
-        {
-            "id": t.id,
-            "name": t.name,
-            "difficulty": t.difficulty,
-            "importance": t.importance,
-            "last_revised": t.last_revised,
-        }
-        for t in topics
-    ]
+    return fast_json([row._asdict() for row in rows], response)
 
 
 @router.delete("/{unit}")
 async def delete_unit(
     unit: str,
     subject: str,
+    stream: bool = False,
+    background: bool = False,
     session: AsyncSession = Depends(get_async_session),
     user=Depends(get_current_user),
 ):
-    stmt = (
-        delete(models.Topic)
-        .where(
-            models.Topic.user_id == user.id,
-            models.Topic.subject == subject,
-            models.Topic.unit == unit,
+    """
+    Delete every topic in the unit along with its revisions, in chunks
+    (see app/unit_ops.py). With ?stream=true progress is reported as
+    NDJSON lines, the last one being the usual response. With
+    ?background=true it runs as a job instead: 202 with the job to poll
+    at /jobs/{id}, whose result is the usual response.
+    """
+    summary = {"unit": unit, "subject": subject}
+
+    if background:
+        job = await submit_job(session, "unit_delete", summary, user_id=user.id)
+        return await accepted_job(session, job)
+
+    if stream:
+        total = await count_unit_topics(session, user.id, subject, unit)
+        await session.close()
+        return progress_stream(
+            lambda s: delete_unit_topics(s, user.id, subject, unit),
+            total,
+            "deleted",
+            summary,
         )
-    )
-
-    result = await session.execute(stmt)
-    await session.commit()
 
-    return {
-        "deleted": result.rowcount,
-        "unit": unit,
-        "subject": subject,
-    }
+    deleted = await run_to_completion(
+        delete_unit_topics(session, user.id, subject, unit)
+    )
+    return {"deleted": deleted, **summary}
 
 class UnitRenameRequest(BaseModel):
     new_unit: str
@@ -97,24 +124,36 @@ async def rename_unit(
     unit: str,
     payload: UnitRenameRequest,
     subject: str,
+    stream: bool = False,
+    background: bool = False,
     session: AsyncSession = Depends(get_async_session),
     user=Depends(get_current_user),
 ):
-    stmt = (
-        update(models.Topic)
-        .where(
-            models.Topic.user_id == user.id,
-            models.Topic.subject == subject,
-            models.Topic.unit == unit,
+    """
+    Move every topic in the unit to new_unit, in chunks. ?stream=true
+    and ?background=true work like they do for delete_unit.
+    """
+    summary = {"old_unit": unit, "new_unit": payload.new_unit}
+
+    if background:
+        job = await submit_job(session, "unit_rename", {
+            "subject": subject,
+            "unit": unit,
+            "new_unit": payload.new_unit,
+        }, user_id=user.id)
+        return await accepted_job(session, job)
+
+    if stream:
+        total = await count_unit_topics(session, user.id, subject, unit)
+        await session.close()
+        return progress_stream(
+            lambda s: rename_unit_topics(s, user.id, subject, unit, payload.new_unit),
+            total,
+            "updated",
+            summary,
         )
-        .values(unit=payload.new_unit)
-    )
-
-    result = await session.execute(stmt)
-    await session.commit()
 
-    return {
-        "updated": result.rowcount,
-        "old_unit": unit,
-        "new_unit": payload.new_unit,
-    }
\ No newline at end of file
+    updated = await run_to_completion(
+        rename_unit_topics(session, user.id, subject, unit, payload.new_unit)
+    )
+    return {"updated": updated, **summary}
\ No newline at end of file
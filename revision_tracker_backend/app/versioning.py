@@ -0,0 +1,171 @@
+# app/versioning.py
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Set
+
+from fastapi import Request, Response, status
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import config
+from app import models
+
+# session.info key: users whose data version this transaction bumped
+_BUMPED_USERS = "bumped_user_ids"
+
+# Postgres NOTIFY channel carrying bumped user ids between workers
+DATA_VERSION_CHANNEL = "data_version"
+
+# user id -> one Event per open watcher (see watch_data_version)
+_watchers: Dict[object, Set[asyncio.Event]] = {}
+
+
+async def bump_data_version(session: AsyncSession, user_id) -> None:
+    """
+    Increment the user's data version inside the caller's transaction.
+    Every write to a user's topics or revisions must call this before
+    committing so cached reads are invalidated.
+    """
+    await session.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(data_version=models.User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    session.info.setdefault(_BUMPED_USERS, set()).add(user_id)
+
+    if config.SERVER_WORKERS > 1:
+        # Delivered on commit to listen_for_data_versions() in every worker
+        await session.execute(
+            select(func.pg_notify(DATA_VERSION_CHANNEL, str(user_id)))
+        )
+
+
+def watch_data_version(user_id) -> asyncio.Event:
+    """
+    Return an Event that is set whenever a transaction that bumped the
+    user's data version commits in this process. The caller clears it
+    after reacting and must call unwatch_data_version() when done.
+    """
+    changed = asyncio.Event()
+    _watchers.setdefault(user_id, set()).add(changed)
+    return changed
+
+
+def unwatch_data_version(user_id, changed: asyncio.Event) -> None:
+    watchers = _watchers.get(user_id)
+    if watchers is not None:
+        watchers.discard(changed)
+        if not watchers:
+            del _watchers[user_id]
+
+
+def _wake_watchers(user_id) -> None:
+    for changed in _watchers.get(user_id, ()):
+        changed.set()
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_watchers(session: Session) -> None:
+    for user_id in session.info.pop(_BUMPED_USERS, ()):
+        _wake_watchers(user_id)
+
+
+async def listen_for_data_versions(engine) -> None:
+    """
+    With several server workers, a write is committed in one process
+    while the user's watchers may be in another. Hold one connection
+    LISTENing on DATA_VERSION_CHANNEL and wake local watchers for every
+    bump, reconnecting if the connection drops.
+    """
+    def on_notify(connection, pid, channel, payload):
+        _wake_watchers(uuid.UUID(payload))
+
+    while True:
+        try:
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                listener = raw.driver_connection
+                await listener.add_listener(DATA_VERSION_CHANNEL, on_notify)
+                try:
+                    while not listener.is_closed():
+                        await asyncio.sleep(config.QUEUE_STREAM_KEEPALIVE_SECONDS)
+                finally:
+                    if not listener.is_closed():
+                        await listener.remove_listener(DATA_VERSION_CHANNEL, on_notify)
+        except Exception as e:
+            print(f"Data version listener error: {e}")
+
+        await asyncio.sleep(1)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_bumps(session: Session) -> None:
+    session.info.pop(_BUMPED_USERS, None)
+
+
+def scoring_time() -> datetime:
+    """
+    The instant priorities are scored against: midnight UTC today, so
+    scores only change at rollover. Time-dependent views include
+    scoring_day() in their ETag so cached copies expire then.
+    """
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def scoring_day() -> str:
+    return scoring_time().date().isoformat()
+
+
+def next_scoring_time(at: datetime) -> datetime:
+    """The first scoring time (UTC midnight) at or after at."""
+    midnight = at.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight if midnight == at else midnight + timedelta(days=1)
+
+
+def seconds_until_rollover() -> float:
+    now = datetime.now(timezone.utc)
+    tomorrow = (now + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return (tomorrow - now).total_seconds()
+
+
+def make_etag(user, *parts) -> str:
+    tag = "-".join([str(user.data_version or 0), *(str(p) for p in parts)])
+    return f'W/"{tag}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+
+    # Weak comparison: ignore W/ prefixes on both sides
+    wanted = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        if candidate.strip().removeprefix("W/") == wanted:
+            return True
+    return False
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+) -> Optional[Response]:
+    """
+    Return a 304 response if the client's If-None-Match matches etag.
+    Otherwise set the ETag header on response and return None so the
+    handler goes on to build the body.
+    """
+    header = request.headers.get("if-none-match")
+    if header and _etag_matches(header, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag},
+        )
+
+    response.headers["ETag"] = etag
+    return None
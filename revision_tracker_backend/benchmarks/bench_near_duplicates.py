@@ -0,0 +1,82 @@
+# benchmarks/bench_near_duplicates.py
+"""
+Compare MinHash/LSH near-duplicate detection with exhaustive pairwise
+Jaccard on synthetic topic names, and report recall against the
+exhaustive result.
+
+Names are built from a few thousand pseudo-words; about 5% of incoming
+names are variants of existing ones (plural/singular, an abbreviation
+in parentheses, different case).
+
+Run from revision_tracker_backend/:
+    python benchmarks/bench_near_duplicates.py [n_incoming] [n_existing]
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates, jaccard, shingles
+
+
+def make_names(n_incoming: int, n_existing: int, seed: int = 11):
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+        for _ in range(3000)
+    ]
+
+    def name():
+        return " ".join(rng.sample(vocabulary, rng.randint(2, 5))).capitalize()
+
+    existing = [name() for _ in range(n_existing)]
+    incoming = []
+    for _ in range(n_incoming):
+        if existing and rng.random() < 0.05:
+            base = rng.choice(existing)
+            variant = rng.choice([
+                base + "s",
+                base.title(),
+                base + " (" + "".join(w[0] for w in base.split()).upper() + ")",
+            ])
+            incoming.append(variant)
+        else:
+            incoming.append(name())
+    return incoming, existing
+
+
+def brute_force(incoming, existing, threshold=DEFAULT_THRESHOLD):
+    names = incoming + existing
+    sets = [shingles(n) for n in names]
+    found = set()
+    for i in range(len(incoming)):
+        for j in range(i + 1, len(names)):
+            if names[i].lower() != names[j].lower() and jaccard(sets[i], sets[j]) >= threshold:
+                found.add((i, j))
+    return found
+
+
+def main():
+    n_incoming = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_existing = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    incoming, existing = make_names(n_incoming, n_existing)
+
+    start = time.perf_counter()
+    lsh = {(i, j) for i, j, _ in find_near_duplicates(incoming, existing)}
+    t_lsh = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact = brute_force(incoming, existing)
+    t_exact = time.perf_counter() - start
+
+    recall = len(lsh & exact) / len(exact) if exact else 1.0
+    print(f"names:     {n_incoming} incoming, {n_existing} existing")
+    print(f"pairwise:  {t_exact * 1000:9.1f} ms  {len(exact)} pairs")
+    print(f"minhash:   {t_lsh * 1000:9.1f} ms  {len(lsh)} pairs, recall {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_parse_offload.py
+"""
+Measure event-loop lag while several large syllabi are parsed
+concurrently, parsing inline on the loop versus through the process pool
+used by /syllabus/parse.
+
+A ticker coroutine sleeps in 5 ms steps and records how late it wakes
+up; that lateness is what every other request on the worker would see.
+
+Run from revision_tracker_backend/:
+    python benchmarks/bench_parse_offload.py [n_documents] [megabytes]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app import parse_pool
+from app.syllabus_cache import SyllabusCache
+from bench_syllabus_parser import make_corpus
+
+TICK = 0.005
+
+
+async def ticker(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def run(label, parse, documents):
+    # Fresh cache so every document is really parsed
+    parse_pool.syllabus_cache = SyllabusCache(max_entries=0)
+
+    lags = []
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(lags, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(parse(doc) for doc in documents))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await tick_task
+
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    print(
+        f"{label:8s} total {elapsed * 1000:8.1f} ms | loop lag "
+        f"median {statistics.median(lags) * 1000:7.1f} ms, "
+        f"p99 {p99 * 1000:7.1f} ms, max {lags[-1] * 1000:7.1f} ms"
+    )
+
+
+async def inline(text):
+    return parse_pool.parse_and_flatten(text)
+
+
+async def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    megabytes = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    documents = [make_corpus(megabytes, seed=i) for i in range(n)]
+
+    # Start workers up front so spawn cost isn't counted as lag
+    await asyncio.gather(*(
+        asyncio.get_running_loop().run_in_executor(parse_pool.get_pool(), len, "")
+        for _ in range(4)
+    ))
+
+    print(f"{n} documents x {megabytes} MB")
+    await run("inline", inline, documents)
+    await run("pool", parse_pool.parse_syllabus_text, documents)
+
+    parse_pool.shutdown_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+# benchmarks/bench_read_models.py
+"""
+Compare full ORM loads with projected read-model rows for the revision
+queue on a single user with 20k topics.
+
+before: select(Topic) -> ORM instances -> per-topic dicts
+after:  read_models.queue_topics -> Row tuples -> per-topic dicts
+
+Uses an in-memory SQLite database through a synchronous session, so the
+numbers isolate ORM hydration cost from the network and driver. Priority
+scoring is identical on both paths and left out.
+
+Run from revision_tracker_backend/:
+    python benchmarks/bench_read_models.py [n_topics]
+"""
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app import models, read_models
+from app.db import Base
+
+
+def seed(session: Session, n: int):
+    user_id = uuid.uuid4()
+    session.execute(insert(models.User), [{
+        "id": user_id,
+        "email": "bench@example.com",
+        "hashed_password": "x",
+    }])
+
+    now = datetime.now(timezone.utc)
+    session.execute(insert(models.Topic), [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "subject": f"Subject {i % 8}",
+            "unit": f"Unit {i % 5 + 1}",
+            "name": f"Topic number {i}",
+            "difficulty": i % 5 + 1,
+            "importance": (i * 7) % 5 + 1,
+            "last_revised": None if i % 3 == 0 else now - timedelta(hours=i % 500),
+        }
+        for i in range(n)
+    ])
+    session.commit()
+    return user_id
+
+
+def build_queue(topics):
+    return [
+        {
+            "id": t.id,
+            "subject": t.subject,
+            "unit": t.unit,
+            "name": t.name,
+            "last_revised": t.last_revised,
+        }
+        for t in topics
+    ]
+
+
+def orm_queue(engine, user_id):
+    with Session(engine) as session:
+        topics = session.execute(
+            select(models.Topic).where(models.Topic.user_id == user_id)
+        ).scalars().all()
+        return build_queue(topics), topics
+
+
+def projected_queue(engine, user_id):
+    with Session(engine) as session:
+        rows = session.execute(read_models.queue_topics(user_id)).all()
+        return build_queue(rows), rows
+
+
+def measure(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        user_id = seed(session, n)
+
+    t_orm, m_orm = measure(lambda: orm_queue(engine, user_id))
+    t_row, m_row = measure(lambda: projected_queue(engine, user_id))
+
+    print(f"topics:          {n}")
+    print(f"orm:       {t_orm * 1000:8.1f} ms  {m_orm / n:8.0f} B/row peak")
+    print(f"projected: {t_row * 1000:8.1f} ms  {m_row / n:8.0f} B/row peak")
+    print(f"cpu:       {t_orm / t_row:8.2f}x faster")
+    print(f"memory:    {m_orm / m_row:8.2f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_serialization.py
+"""
+Compare response serialization for GET /topics/ at 10k topics.
+
+before: response_model validation (TopicRead per row) + jsonable_encoder
+        + stdlib json, i.e. FastAPI's default path
+after:  plain dicts rendered by FastJSONResponse (orjson)
+
+Run from revision_tracker_backend/:
+    python benchmarks/bench_serialization.py [n_topics]
+"""
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.responses import ModelJSONResponse
+from app.schemas import TopicRead
+
+
+def make_topics(n: int):
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            subject=f"Subject {i % 8}",
+            unit=f"Unit {i % 5 + 1}",
+            name=f"Topic number {i}",
+            difficulty=i % 5 + 1,
+            importance=(i * 7) % 5 + 1,
+            created_at=now - timedelta(days=i % 90),
+            last_revised=None if i % 3 == 0 else now - timedelta(hours=i % 500),
+        )
+        for i in range(n)
+    ]
+
+
+def before(topics, adapter):
+    validated = adapter.validate_python(topics, from_attributes=True)
+    return json.dumps(
+        jsonable_encoder(validated),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def after(topics):
+    return ModelJSONResponse([
+        {
+            "id": t.id,
+            "subject": t.subject,
+            "unit": t.unit,
+            "name": t.name,
+            "difficulty": t.difficulty,
+            "importance": t.importance,
+            "created_at": t.created_at,
+            "last_revised": t.last_revised,
+        }
+        for t in topics
+    ]).body
+
+
+def best_of(fn, repeat=7):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    topics = make_topics(n)
+    adapter = TypeAdapter(list[TopicRead])
+
+    # Both paths must produce the same document
+    assert json.loads(before(topics, adapter)) == json.loads(after(topics))
+
+    t_before = best_of(lambda: before(topics, adapter))
+    t_after = best_of(lambda: after(topics))
+
+    print(f"topics:  {n}")
+    print(f"before:  {t_before * 1000:8.2f} ms")
+    print(f"after:   {t_after * 1000:8.2f} ms")
+    print(f"speedup: {t_before / t_after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
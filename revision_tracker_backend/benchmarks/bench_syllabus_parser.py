@@ -0,0 +1,200 @@
+# benchmarks/bench_syllabus_parser.py
+"""
+Benchmark parse_syllabus on a multi-megabyte synthetic corpus against
+the previous implementation (kept below verbatim as legacy_*), and check
+both produce identical output.
+
+Run from revision_tracker_backend/:
+    python benchmarks/bench_syllabus_parser.py [megabytes]
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.syllabus_parser import MAX_TOPIC_LENGTH, parse_syllabus
+
+
+# ---- previous implementation -------------------------------------------
+
+class ParserState:
+    def __init__(self):
+        self.current_subject: Optional[Dict] = None
+        self.current_unit: Optional[Dict] = None
+        self.has_seen_unit = False
+
+
+def ensure_subject(state: ParserState, syllabus: List[Dict]):
+    if not state.current_subject:
+        state.current_subject = {"subject": "General", "units": []}
+        syllabus.append(state.current_subject)
+
+
+def ensure_unit(state: ParserState):
+    if not state.current_unit:
+        state.current_unit = {"unit": "Unit 1", "topics": []}
+        state.current_subject["units"].append(state.current_unit)
+
+
+def legacy_normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def legacy_looks_like_unit(line: str) -> bool:
+    return bool(re.match(r"^(unit|module|chapter)\s*[-:]?\s*(\d+|[ivx]+)", line.lower()))
+
+
+def legacy_looks_like_subject(line: str) -> bool:
+    if len(line) > 60:
+        return False
+    if legacy_looks_like_unit(line):
+        return False
+    if len(line.split()) > 8:
+        return False
+    return line[0].isupper() and not re.match(r"^[-•*]", line)
+
+
+def legacy_looks_like_bullet(line: str) -> bool:
+    return bool(re.match(r"^[-•*]\s+", line))
+
+
+def legacy_is_valid_topic(line: str) -> bool:
+    if len(line) < 2 or len(line) > MAX_TOPIC_LENGTH:
+        return False
+    return True
+
+
+def legacy_split_topics(text: str) -> List[str]:
+    parts = re.split(r",|;", text)
+    return [legacy_normalize(p) for p in parts if legacy_is_valid_topic(legacy_normalize(p))]
+
+
+def legacy_parse_syllabus(raw_text: str) -> List[Dict]:
+    lines = raw_text.splitlines()
+    syllabus: List[Dict] = []
+    state = ParserState()
+
+    for raw in lines:
+        line = legacy_normalize(raw)
+        if not line:
+            continue
+
+        if legacy_looks_like_subject(line) and not state.has_seen_unit:
+            state.current_subject = {"subject": line, "units": []}
+            syllabus.append(state.current_subject)
+            state.current_unit = None
+            continue
+
+        ensure_subject(state, syllabus)
+
+        if legacy_looks_like_unit(line) and ":" in line:
+            unit_part, topic_part = line.split(":", 1)
+            unit_name = legacy_normalize(unit_part)
+            topics = legacy_split_topics(topic_part)
+
+            state.current_unit = {"unit": unit_name, "topics": topics}
+            state.current_subject["units"].append(state.current_unit)
+            state.has_seen_unit = True
+            continue
+
+        if legacy_looks_like_unit(line):
+            state.current_unit = {"unit": line, "topics": []}
+            state.current_subject["units"].append(state.current_unit)
+            state.has_seen_unit = True
+            continue
+
+        ensure_unit(state)
+
+        if legacy_looks_like_bullet(line):
+            topic = legacy_normalize(re.sub(r"^[-•*]\s+", "", line))
+            if legacy_is_valid_topic(topic):
+                state.current_unit["topics"].append(topic)
+            continue
+
+        comma_topics = legacy_split_topics(line)
+        if len(comma_topics) >= 3:
+            state.current_unit["topics"].extend(comma_topics)
+            continue
+
+        if legacy_is_valid_topic(line):
+            state.current_unit["topics"].append(line)
+
+    return syllabus
+
+
+# ---- corpus ------------------------------------------------------------
+
+WORDS = (
+    "binary search trees graphs hashing sorting dynamic programming greedy "
+    "algorithms memory management paging scheduling deadlocks processes "
+    "threads normalization transactions indexing recursion complexity"
+).split()
+
+
+def make_corpus(megabytes: float, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    target = int(megabytes * 1024 * 1024)
+    out = ["Computer Science Syllabus", ""]
+    size = 0
+    unit = 0
+
+    def emit(line: str):
+        nonlocal size
+        out.append(line)
+        size += len(line) + 1
+
+    while size < target:
+        unit += 1
+        kind = rng.random()
+        if kind < 0.3:
+            emit(f"Unit {unit}: " + ", ".join(
+                " ".join(rng.sample(WORDS, 2)) for _ in range(rng.randint(2, 6))
+            ))
+        elif kind < 0.6:
+            emit(f"MODULE   {unit}")
+        else:
+            emit(f"Chapter - {unit}")
+
+        for _ in range(rng.randint(3, 12)):
+            style = rng.random()
+            if style < 0.4:
+                emit(f"{rng.choice('-•*')}  " + " ".join(rng.sample(WORDS, 3)).capitalize())
+            elif style < 0.7:
+                emit(", ".join(" ".join(rng.sample(WORDS, 2)) for _ in range(rng.randint(3, 5))))
+            else:
+                emit("\t" + " ".join(rng.sample(WORDS, rng.randint(2, 6))) + "   ")
+        emit("")
+
+    return "\n".join(out)
+
+
+def best_of(fn, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    corpus = make_corpus(megabytes)
+
+    assert legacy_parse_syllabus(corpus) == parse_syllabus(corpus)
+
+    t_legacy = best_of(lambda: legacy_parse_syllabus(corpus))
+    t_new = best_of(lambda: parse_syllabus(corpus))
+
+    print(f"corpus:  {len(corpus) / 1024 / 1024:.1f} MB, {corpus.count(chr(10)) + 1} lines")
+    print(f"legacy:  {t_legacy * 1000:8.1f} ms")
+    print(f"current: {t_new * 1000:8.1f} ms")
+    print(f"speedup: {t_legacy / t_new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# benchmarks/bench_unit_wise.py
+"""
+Compare the full unit-wise queue with the summary (counts only) for a
+single user with 20k topics.
+
+full:    score every topic, build a dict per topic, sort every bucket,
+         then count
+summary: read the persisted unit_progress counters (one row per unit)
+
+Topic rows are built in memory with the read-model attribute names, so
+the full path measures only the Python work; the summary path includes
+its query against an in-memory SQLite database.
+
+Run from revision_tracker_backend/:
+    python benchmarks/bench_unit_wise.py [n_topics]
+"""
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app import models, read_models
+from app.db import Base
+from app.revision_logic import bucket_from_priority, compute_priority
+from app.revision_queue import (
+    bucket_topic,
+    compute_subject_progress,
+    compute_unit_progress,
+    progress_from_counts,
+)
+
+Row = namedtuple(
+    "Row", "id subject unit name difficulty importance last_revised"
+)
+
+
+def make_rows(n: int):
+    now = datetime.now(timezone.utc)
+    return [
+        Row(
+            uuid.uuid4(),
+            f"Subject {i % 8}",
+            f"Unit {i % 5 + 1}",
+            f"Topic number {i}",
+            i % 5 + 1,
+            (i * 7) % 5 + 1,
+            None if i % 3 == 0 else now - timedelta(hours=i % 2000),
+        )
+        for i in range(n)
+    ]
+
+
+def full(rows):
+    queue = {}
+    for topic in rows:
+        priority = compute_priority(topic)
+        unit = queue.setdefault(topic.subject, {}).setdefault(topic.unit, {
+            "buckets": {"overdue": [], "due": [], "fresh": []},
+            "progress": {},
+        })
+        unit["buckets"][bucket_from_priority(priority)].append(
+            bucket_topic(topic, priority)
+        )
+
+    for units in queue.values():
+        for unit in units.values():
+            for topics in unit["buckets"].values():
+                topics.sort(key=lambda t: t["priority"], reverse=True)
+            unit["progress"] = compute_unit_progress(unit["buckets"])
+        units["_meta"] = compute_subject_progress(units)
+    return queue
+
+
+def seed_counters(engine, queue):
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.execute(insert(models.UnitProgress), [
+            {
+                "user_id": user_id,
+                "subject": subject,
+                "unit": unit,
+                **{b: len(topics) for b, topics in data["buckets"].items()},
+            }
+            for subject, units in queue.items()
+            for unit, data in units.items()
+            if unit != "_meta"
+        ])
+        session.commit()
+    return user_id
+
+
+def summary(engine, user_id):
+    with Session(engine) as session:
+        rows = session.execute(read_models.unit_progress(user_id)).all()
+
+    overview = {}
+    for row in rows:
+        overview.setdefault(row.subject, {})[row.unit] = {
+            "progress": progress_from_counts(row.overdue, row.due, row.fresh)
+        }
+    for units in overview.values():
+        units["_meta"] = compute_subject_progress(units)
+    return overview
+
+
+def measure(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rows = make_rows(n)
+    queue = full(rows)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    user_id = seed_counters(engine, queue)
+
+    expected = {
+        s: {u: v if u == "_meta" else {"progress": v["progress"]} for u, v in units.items()}
+        for s, units in queue.items()
+    }
+    assert summary(engine, user_id) == expected
+
+    t_full = measure(lambda: full(rows))
+    t_summary = measure(lambda: summary(engine, user_id))
+
+    print(f"topics:   {n}")
+    print(f"full:     {t_full * 1000:8.1f} ms")
+    print(f"summary:  {t_summary * 1000:8.1f} ms")
+    print(f"speedup:  {t_full / t_summary:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_what_if.py
+"""
+Compare the top-K under every priority mode computed as one queue per
+mode (compute_priority + full sort, three scans) with the what-if path
+(factors once per topic, weighted per mode into k-sized heaps).
+
+Rows are built in memory with the read-model attribute names, so the
+numbers isolate the Python work from the database.
+
+Run from revision_tracker_backend/:
+    python benchmarks/bench_what_if.py [n_topics] [k]
+"""
+import heapq
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.revision_logic import (
+    compute_priority,
+    priority_factors,
+    priority_modes,
+    weighted_priority,
+)
+
+Row = namedtuple("Row", "id subject unit name difficulty importance last_revised")
+
+
+def make_rows(n: int):
+    now = datetime.now(timezone.utc)
+    return [
+        Row(
+            uuid.uuid4(),
+            f"Subject {i % 8}",
+            f"Unit {i % 5 + 1}",
+            f"Topic number {i}",
+            i % 5 + 1,
+            (i * 7) % 5 + 1,
+            None if i % 3 == 0 else now - timedelta(hours=i % 2000),
+        )
+        for i in range(n)
+    ]
+
+
+def per_mode(rows, k):
+    now = datetime.now(timezone.utc)
+    tops = {}
+    for mode in priority_modes:
+        scored = [(compute_priority(t, mode, now), t.id) for t in rows]
+        scored.sort(reverse=True)
+        tops[mode] = [p for p, _ in scored[:k]]
+    return tops
+
+
+def one_pass(rows, k):
+    now = datetime.now(timezone.utc)
+    modes = list(priority_modes.items())
+    heaps = {mode: [] for mode in priority_modes}
+    for topic in rows:
+        factors = priority_factors(topic, now)
+        for mode, weights in modes:
+            entry = (weighted_priority(weights, factors), topic.id)
+            heap = heaps[mode]
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+    return {mode: [p for p, _ in sorted(heap, reverse=True)] for mode, heap in heaps.items()}
+
+
+def measure(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = make_rows(n)
+
+    assert per_mode(rows, k) == one_pass(rows, k)
+
+    t_modes = measure(lambda: per_mode(rows, k))
+    t_once = measure(lambda: one_pass(rows, k))
+
+    print(f"topics:    {n}, k={k}, modes={len(priority_modes)}")
+    print(f"per mode:  {t_modes * 1000:8.1f} ms")
+    print(f"one pass:  {t_once * 1000:8.1f} ms")
+    print(f"speedup:   {t_modes / t_once:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_workers.py
+"""
+Compare throughput of the production server with one worker and with
+several, under the same load_test.py scenario.
+
+For each worker count it starts `python main.py --prod --workers N`,
+waits for it to answer, runs the load driver for --duration seconds,
+then stops the server with SIGTERM (which exercises the graceful
+shutdown). DB_CONNECTION_BUDGET is split the same way main.py does, so
+both runs get the same total number of connections.
+
+Load a dataset with benchmarks/load_data.py first; DATABASE_URL is
+passed through to the servers. Needs httpx. Run from
+revision_tracker_backend/:
+    python benchmarks/bench_workers.py --workers 1 4 --concurrency 32 \\
+        --duration 30 [--out workers.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+import load_test
+from load_data import EMAIL_PREFIX, PASSWORD
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+def run_with_workers(workers: int, args) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "main.py", "--prod", "--workers", str(workers), "--port", str(args.port)],
+        cwd=ROOT,
+        # Raw capacity: no per-user limits
+        env={**os.environ, "SQL_ECHO": "0", "ADMISSION_ENABLED": "0"},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(base_url, server)
+        load_args = argparse.Namespace(
+            base_url=base_url,
+            users=args.users,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            timeout=args.timeout,
+            email_prefix=args.email_prefix,
+            password=args.password,
+        )
+        report = asyncio.run(load_test.run(load_args))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    report["meta"]["workers"] = workers
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 2])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--users", type=int, default=50, help="users created by load_data.py")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30, help="seconds per run")
+    parser.add_argument("--timeout", type=float, default=30, help="per request, seconds")
+    parser.add_argument("--email-prefix", default=EMAIL_PREFIX)
+    parser.add_argument("--password", default=PASSWORD)
+    parser.add_argument("--out", type=Path, help="write all runs as JSON")
+    args = parser.parse_args()
+
+    reports = [run_with_workers(n, args) for n in args.workers]
+
+    print(f"{'workers':>7} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for report in reports:
+        total = report["total"]
+        print(
+            f"{report['meta']['workers']:7} {total['throughput_rps']:9.1f} "
+            f"{total['p50_ms']:8.1f} {total['p95_ms']:8.1f} {total['p99_ms']:8.1f} "
+            f"{total['errors']:7}"
+        )
+
+    base = reports[0]["total"]["throughput_rps"]
+    for report in reports[1:]:
+        if base:
+            ratio = report["total"]["throughput_rps"] / base
+            print(f"{report['meta']['workers']} workers: {ratio:.2f}x the throughput of {reports[0]['meta']['workers']}")
+
+    if args.out:
+        args.out.write_text(json.dumps(reports, indent=2))
+        print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/check_import_time.py
+"""
+Fail (exit 1) when cold import time or the import graph regresses.
+
+Each module in CHECKS is imported --runs times in a fresh interpreter
+with -X importtime, and the fastest run is kept:
+- "total" is the cumulative import time of the module, everything it
+  pulls in included. This is dominated by FastAPI, SQLAlchemy and
+  pydantic and is noisy on shared machines, so its budget is loose.
+- "own" is the self time of this repo's modules (app.*, config): code
+  run at import, route and model definitions. It is small and stable,
+  so its budget catches module-level work creeping in.
+- "forbidden" lists packages the import must not load at all. The
+  service loads jose and bcrypt on the first login or authenticated
+  request, and the process pool's workers must not import the web stack.
+
+This is a manual check: nothing runs it automatically, as the repo has
+no test suite or CI. Run it before merging changes to what the app or
+its modules import at startup, from revision_tracker_backend/:
+    python benchmarks/check_import_time.py [--runs 5] [--scale 1.5]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# module -> (total budget ms, own budget ms, packages it must not import)
+CHECKS = {
+    "app.app": (1500, 150, ("jose", "bcrypt", "multiprocessing")),
+    "app.progress": (1200, 80, ("jose", "bcrypt")),
+    # What a spawned parse worker imports to unpickle its function
+    "app.syllabus_cache": (200, 30, ("fastapi", "sqlalchemy", "pydantic")),
+}
+
+_REPORT_LOADED = "import sys; print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"
+
+
+def _is_own(name: str) -> bool:
+    return name == "config" or name == "app" or name.startswith("app.")
+
+
+def measure(module: str) -> dict:
+    """One cold import: total and own time in ms, and top-level packages loaded."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}; {_REPORT_LOADED}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = own = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if _is_own(name):
+            own += int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+
+    return {
+        "total_ms": total / 1000,
+        "own_ms": own / 1000,
+        "loaded": set(proc.stdout.split()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every time budget, e.g. for slow CI runners")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':20} {'total ms':>9} {'budget':>7} {'own ms':>7} {'budget':>7}")
+    for module, (total_budget, own_budget, forbidden) in CHECKS.items():
+        runs = [measure(module) for _ in range(args.runs)]
+        total = min(run["total_ms"] for run in runs)
+        own = min(run["own_ms"] for run in runs)
+        total_budget *= args.scale
+        own_budget *= args.scale
+        print(f"{module:20} {total:9.1f} {total_budget:7.0f} {own:7.1f} {own_budget:7.0f}")
+
+        if total > total_budget:
+            failures.append(f"{module}: {total:.1f} ms total, budget {total_budget:.0f} ms")
+        if own > own_budget:
+            failures.append(f"{module}: {own:.1f} ms in app modules, budget {own_budget:.0f} ms")
+        loaded = sorted(set(forbidden) & runs[0]["loaded"])
+        if loaded:
+            failures.append(f"{module}: imports {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/check_jobs.py
+"""
+Check the job queue against a real database; exit 1 on failure.
+
+- --submits concurrent submit_job(unique=True) calls for one user, each
+  in its own transaction, must queue exactly one job.
+- run_pending_jobs() must run that job to success, after which a new
+  unique submit queues a fresh job.
+
+A throwaway user is created and deleted, with its jobs, afterwards.
+run_pending_jobs() runs every ready job in the table, so point
+DATABASE_URL at a scratch database.
+
+Like check_import_time.py, this is a manual check. Run it before
+merging changes to app/jobs.py, from revision_tracker_backend/:
+    DATABASE_URL=... python benchmarks/check_jobs.py [--submits 20]
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, select
+
+from app import db, models
+from app.jobs import ACTIVE_STATUSES, run_pending_jobs, submit_job
+import app.progress  # noqa: F401  registers the progress_rebuild handler
+
+KIND = "progress_rebuild"
+
+
+async def submit(user_id) -> uuid.UUID:
+    async with db.AsyncSessionLocal() as session:
+        job = await submit_job(session, KIND, user_id=user_id, unique=True)
+        await session.commit()
+        return job.id
+
+
+async def jobs_for(user_id):
+    async with db.AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(models.Job.id, models.Job.status).where(
+                models.Job.user_id == user_id,
+                models.Job.kind == KIND,
+            )
+        )
+        return result.all()
+
+
+async def run(args) -> list:
+    failures = []
+
+    async with db.engine.begin() as conn:
+        await conn.run_sync(db.Base.metadata.create_all)
+
+    user_id = uuid.uuid4()
+    async with db.AsyncSessionLocal() as session:
+        session.add(models.User(
+            id=user_id,
+            email=f"check-jobs-{user_id}@example.com",
+            hashed_password="!",
+        ))
+        await session.commit()
+
+    try:
+        ids = set(await asyncio.gather(*(submit(user_id) for _ in range(args.submits))))
+        jobs = await jobs_for(user_id)
+        print(f"{args.submits} concurrent unique submits: {len(ids)} job id(s), {len(jobs)} row(s)")
+        if len(ids) != 1 or len(jobs) != 1:
+            failures.append(f"unique submits queued {len(jobs)} jobs")
+
+        ran = await run_pending_jobs()
+        statuses = {status for _, status in await jobs_for(user_id)}
+        print(f"run_pending_jobs ran {ran} attempt(s); statuses {sorted(statuses)}")
+        if statuses != {"succeeded"}:
+            failures.append(f"job ended as {sorted(statuses)}")
+
+        again = await submit(user_id)
+        active = [
+            job_id for job_id, status in await jobs_for(user_id)
+            if status in ACTIVE_STATUSES
+        ]
+        if again in ids or active != [again]:
+            failures.append("no fresh job queued once the first finished")
+    finally:
+        async with db.AsyncSessionLocal() as session:
+            await session.execute(delete(models.Job).where(models.Job.user_id == user_id))
+            await session.execute(delete(models.User).where(models.User.id == user_id))
+            await session.commit()
+        await db.engine.dispose()
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--submits", type=int, default=20, help="concurrent unique submits")
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args))
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
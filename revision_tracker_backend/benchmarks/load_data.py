@@ -0,0 +1,215 @@
+# benchmarks/load_data.py
+"""
+Generate a synthetic dataset for load testing.
+
+Creates N users (load-0@example.com, load-1@example.com, ... all with
+the same password), each with the given number of subjects, units per
+subject and topics per unit. Topics get a revision history that looks
+like spaced repetition: gaps that roughly double after each revision
+(up to MAX_GAP_DAYS), confidence that climbs as the topic is revised
+more, and some topics never revised at all. Topic buckets and the unit_progress counters are
+filled in too, so the data looks like it was written through the API.
+
+Everything is loaded with set-based inserts in batches of BATCH_SIZE
+rows; one bcrypt hash is shared by every user.
+
+Run from revision_tracker_backend/:
+    python benchmarks/load_data.py --users 50 --subjects 4 --units 5 \\
+        --topics 25 --revisions 4 [--reset] [--database-url URL]
+
+Then drive load against a running server with benchmarks/load_test.py.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import db, models
+from app.progress import BUCKETS, bucket_state
+from app.revision_logic import priority_modes
+from app.security import hash_password
+from app.versioning import scoring_time
+
+EMAIL_PREFIX = "load"
+PASSWORD = "load-test-password"
+BATCH_SIZE = 5000
+
+# Days between the first and second revision; later gaps grow by ~2x
+# up to MAX_GAP_DAYS
+FIRST_GAP_DAYS = 1.0
+MAX_GAP_DAYS = 90.0
+MAX_REVISIONS = 20
+
+Scored = namedtuple("Scored", "difficulty importance last_revised")
+
+
+def user_email(index: int, prefix: str = EMAIL_PREFIX) -> str:
+    return f"{prefix}-{index}@example.com"
+
+
+def revision_history(rng: random.Random, now: datetime, mean_revisions: float):
+    """
+    (revised_at, confidence) pairs, oldest first, ending before now.
+    Expanding gaps with jitter; confidence drifts up with each revision.
+    """
+    count = 0
+    if mean_revisions:
+        count = min(int(rng.expovariate(1 / mean_revisions)), MAX_REVISIONS)
+    if count == 0:
+        return []
+
+    gaps = []
+    gap = FIRST_GAP_DAYS
+    for _ in range(count - 1):
+        gaps.append(gap * rng.uniform(0.6, 1.6))
+        gap = min(gap * 2, MAX_GAP_DAYS)
+
+    # The last revision was some time ago, up to a month
+    revised_at = now - timedelta(days=rng.uniform(0, 30))
+    history = [revised_at]
+    for gap in reversed(gaps):
+        revised_at -= timedelta(days=gap)
+        history.append(revised_at)
+    history.reverse()
+
+    confidence = rng.randint(1, 3)
+    out = []
+    for at in history:
+        out.append((at, confidence))
+        confidence = max(1, min(5, confidence + rng.choice((-1, 0, 1, 1))))
+    return out
+
+
+async def flush(conn, pending: dict, totals: dict) -> None:
+    # Parents first: users, then topics, then revisions and counters
+    for table, rows in pending.items():
+        for start in range(0, len(rows), BATCH_SIZE):
+            await conn.execute(insert(table), rows[start:start + BATCH_SIZE])
+        totals[table.__tablename__] += len(rows)
+        rows.clear()
+
+
+async def generate(args) -> dict:
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    scored_at = scoring_time()
+    engine = create_async_engine(args.database_url)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(db.Base.metadata.create_all)
+
+        emails = [user_email(i, args.email_prefix) for i in range(args.users)]
+        if args.reset:
+            ids = select(models.User.id).where(models.User.email.in_(emails))
+            topic_ids = select(models.Topic.id).where(models.Topic.user_id.in_(ids))
+            await conn.execute(delete(models.Revision).where(models.Revision.topic_id.in_(topic_ids)))
+            for table in (models.Topic, models.UnitProgress, models.Job):
+                await conn.execute(delete(table).where(table.user_id.in_(ids)))
+            await conn.execute(delete(models.User).where(models.User.id.in_(ids)))
+
+        hashed = hash_password(args.password)
+        users, topics, revisions, progress = [], [], [], []
+        pending = {
+            models.User: users,
+            models.Topic: topics,
+            models.Revision: revisions,
+            models.UnitProgress: progress,
+        }
+        totals = {table.__tablename__: 0 for table in pending}
+
+        for email in emails:
+            user_id = uuid.uuid4()
+            users.append({
+                "id": user_id,
+                "email": email,
+                "hashed_password": hashed,
+                "priority_mode": rng.choice(list(priority_modes)),
+            })
+
+            for s in range(args.subjects):
+                subject = f"Subject {s + 1}"
+                for u in range(args.units):
+                    unit = f"Unit {u + 1}"
+                    counts = dict.fromkeys(BUCKETS, 0)
+
+                    for t in range(args.topics):
+                        topic_id = uuid.uuid4()
+                        history = revision_history(rng, now, args.revisions)
+                        last_revised = history[-1][0] if history else None
+                        difficulty = rng.randint(1, 5)
+                        importance = rng.randint(1, 5)
+
+                        bucket, changes_at = bucket_state(
+                            Scored(difficulty, importance, last_revised), scored_at
+                        )
+                        counts[bucket] += 1
+
+                        topics.append({
+                            "id": topic_id,
+                            "user_id": user_id,
+                            "subject": subject,
+                            "unit": unit,
+                            "name": f"{subject} {unit} topic {t + 1}",
+                            "difficulty": difficulty,
+                            "importance": importance,
+                            "created_at": history[0][0] if history else now,
+                            "last_revised": last_revised,
+                            "bucket": bucket,
+                            "bucket_changes_at": changes_at,
+                        })
+                        revisions.extend(
+                            {"topic_id": topic_id, "revised_at": at, "confidence": c}
+                            for at, c in history
+                        )
+
+                    progress.append({
+                        "user_id": user_id,
+                        "subject": subject,
+                        "unit": unit,
+                        **counts,
+                    })
+
+            if len(revisions) >= BATCH_SIZE:
+                await flush(conn, pending, totals)
+
+        await flush(conn, pending, totals)
+
+    await engine.dispose()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--subjects", type=int, default=4, help="per user")
+    parser.add_argument("--units", type=int, default=5, help="per subject")
+    parser.add_argument("--topics", type=int, default=25, help="per unit")
+    parser.add_argument("--revisions", type=float, default=4, help="mean per topic")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--email-prefix", default=EMAIL_PREFIX)
+    parser.add_argument("--password", default=PASSWORD)
+    parser.add_argument("--database-url", default=db.DATABASE_URL)
+    parser.add_argument("--reset", action="store_true",
+                        help="delete these users and their data first")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = asyncio.run(generate(args))
+    elapsed = time.perf_counter() - start
+
+    print(", ".join(f"{n} {name}" for name, n in counts.items()))
+    print(f"loaded in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
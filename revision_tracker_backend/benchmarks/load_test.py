@@ -0,0 +1,257 @@
+# benchmarks/load_test.py
+"""
+Drive load against a running server and report latency per endpoint.
+
+--concurrency virtual clients each log in as one of the users created
+by benchmarks/load_data.py, then send requests back to back for
+--duration seconds, picking the endpoint at random by the weights in
+SCENARIO: the revision queue, the unit-wise view (full and summary),
+the /revisions analytics, POST /topics/bulk and /auth/login itself.
+
+Per endpoint it reports count, errors, throughput and p50/p95/p99
+latency, and writes them with the run's settings and git commit to a
+JSON file. --compare takes an earlier results file and prints the
+change per endpoint, so runs on two commits can be compared directly.
+
+429 and 503 answers from admission control are counted as "rejected",
+not errors. Start the server with ADMISSION_ENABLED=0 to measure raw
+capacity rather than the per-user limits.
+
+Needs httpx. With the server running (e.g. uvicorn app.app:app):
+    python benchmarks/load_test.py --users 50 --concurrency 20 \\
+        --duration 30 --out results.json [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from load_data import EMAIL_PREFIX, PASSWORD, user_email
+
+# label -> (method, path, weight); the label is what results are keyed by
+SCENARIO = {
+    "GET /revision-queue/": ("GET", "/revision-queue/", 20),
+    "GET /revision-queue/unit-wise": ("GET", "/revision-queue/unit-wise", 8),
+    "GET /revision-queue/unit-wise?summary": ("GET", "/revision-queue/unit-wise?summary=true", 8),
+    "GET /revisions/daily-goal": ("GET", "/revisions/daily-goal", 6),
+    "GET /revisions/weekly-summary": ("GET", "/revisions/weekly-summary", 6),
+    "GET /revisions/weekly-summary/subject": ("GET", "/revisions/weekly-summary/subject", 4),
+    "GET /revisions/subject-balance": ("GET", "/revisions/subject-balance", 4),
+    "GET /revisions/daily-goal/subject": ("GET", "/revisions/daily-goal/subject", 4),
+    "GET /revisions/streak": ("GET", "/revisions/streak", 4),
+    "POST /topics/bulk": ("POST", "/topics/bulk", 3),
+    "POST /auth/login": ("POST", "/auth/login", 1),
+}
+
+BULK_TOPICS = 10
+
+# Admission control's answers; retried later by a real client
+REJECTED_STATUSES = (429, 503)
+
+# Topic names are unique per user, so bulk-created names carry a run id
+_run_id = uuid.uuid4().hex[:8]
+_bulk_names = itertools.count()
+
+
+def percentile(sorted_values, p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, errors: int, rejected: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "rejected": rejected,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+    }
+
+
+def request_kwargs(label: str, credentials: dict) -> dict:
+    if label == "POST /auth/login":
+        return {"json": credentials}
+
+    if label == "POST /topics/bulk":
+        batch = next(_bulk_names)
+        return {"json": [
+            {
+                "subject": "Load test",
+                "unit": f"Batch {batch}",
+                "name": f"Load test topic {_run_id}-{batch}-{i}",
+                "difficulty": random.randint(1, 5),
+                "importance": random.randint(1, 5),
+            }
+            for i in range(BULK_TOPICS)
+        ]}
+
+    return {}
+
+
+async def timed(client, results, label, method, path, **kwargs):
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, path, **kwargs)
+        status_code = response.status_code
+    except httpx.HTTPError:
+        response, status_code = None, None
+
+    # counts: [errors, rejected by admission control]
+    latencies, counts = results.setdefault(label, ([], [0, 0]))
+    latencies.append(time.perf_counter() - start)
+    if status_code in REJECTED_STATUSES:
+        counts[1] += 1
+    elif status_code is None or status_code >= 400:
+        counts[0] += 1
+    return response
+
+
+async def virtual_client(client, results, credentials, labels, weights, deadline):
+    response = await timed(
+        client, results, "POST /auth/login", "POST", "/auth/login", json=credentials
+    )
+    if response is None or response.status_code != 200:
+        raise RuntimeError(f"Login failed for {credentials['email']}")
+
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    while time.perf_counter() < deadline:
+        label = random.choices(labels, weights)[0]
+        method, path, _ = SCENARIO[label]
+        await timed(
+            client, results, label, method, path,
+            headers=headers, **request_kwargs(label, credentials),
+        )
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> dict:
+    labels = list(SCENARIO)
+    weights = [SCENARIO[label][2] for label in labels]
+    results = {}
+    started_at = datetime.now(timezone.utc)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            virtual_client(
+                client,
+                results,
+                {"email": user_email(i % args.users, args.email_prefix), "password": args.password},
+                labels,
+                weights,
+                deadline,
+            )
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    endpoints = {
+        label: summarize(latencies, counts[0], counts[1], elapsed)
+        for label, (latencies, counts) in sorted(results.items())
+    }
+    everything = [t for latencies, _ in results.values() for t in latencies]
+    total_errors = sum(counts[0] for _, counts in results.values())
+    total_rejected = sum(counts[1] for _, counts in results.values())
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": started_at.isoformat(),
+            "base_url": args.base_url,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+        },
+        "total": summarize(everything, total_errors, total_rejected, elapsed),
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict, baseline: dict = None) -> None:
+    meta = report["meta"]
+    print(f"commit {meta['commit']}, {meta['concurrency']} clients, {meta['duration_s']} s")
+    header = f"{'endpoint':42} {'count':>7} {'err':>5} {'rej':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for label, stats in rows:
+        print(
+            f"{label:42} {stats['count']:7} {stats['errors']:5} "
+            f"{stats.get('rejected', 0):5} "
+            f"{stats['throughput_rps']:8.1f} {stats['p50_ms']:8.1f} "
+            f"{stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f}"
+        )
+
+    if baseline is None:
+        return
+
+    print(f"\nchange vs {baseline['meta']['commit']} (negative latency is better)")
+    base_rows = {**baseline["endpoints"], "total": baseline["total"]}
+    for label, stats in rows:
+        old = base_rows.get(label)
+        if not old:
+            continue
+        changes = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if old[key]:
+                changes.append(f"{key.split('_')[0]} {(stats[key] / old[key] - 1) * 100:+6.1f}%")
+        print(f"{label:42} " + "  ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=50, help="users created by load_data.py")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--timeout", type=float, default=30, help="per request, seconds")
+    parser.add_argument("--email-prefix", default=EMAIL_PREFIX)
+    parser.add_argument("--password", default=PASSWORD)
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"\nwrote {args.out}")
+
+    if report["total"]["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,81 @@
+import argparse
+import os
+import sys
+
 import uvicorn
 
-if __name__ == "__main__":
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Revision Optimizer API.")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="multi-worker production mode instead of the auto-reloading dev server",
+    )
+    parser.add_argument("--host", help="default SERVER_HOST")
+    parser.add_argument("--port", type=int, help="default SERVER_PORT")
+    parser.add_argument("--workers", type=int, help="default SERVER_WORKERS (--prod only)")
+    parser.add_argument("--loop", choices=("auto", "asyncio", "uvloop"), help="default SERVER_LOOP")
+    parser.add_argument("--http", choices=("auto", "h11", "httptools"), help="default SERVER_HTTP")
+    args = parser.parse_args()
+
+    # Workers are separate processes that import config themselves, so
+    # overrides go through the environment rather than module globals
+    overrides = {
+        "SERVER_HOST": args.host,
+        "SERVER_PORT": args.port,
+        "SERVER_WORKERS": args.workers,
+        "SERVER_LOOP": args.loop,
+        "SERVER_HTTP": args.http,
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            os.environ[name] = str(value)
+
+    if not args.prod:
+        os.environ["SERVER_WORKERS"] = "1"
+
+    import config
+
+    if config.DB_REQUEST_CONNECTIONS < 1:
+        # Each worker needs a connection for requests, plus one for the
+        # data version listener when there are several
+        per_worker = 2 if config.SERVER_WORKERS > 1 else 1
+        sys.exit(
+            f"DB_CONNECTION_BUDGET={config.DB_CONNECTION_BUDGET} can't give "
+            f"{config.SERVER_WORKERS} worker(s) {per_worker} connection(s) each; "
+            f"raise it to {per_worker * config.SERVER_WORKERS} or run fewer workers"
+        )
+
+    if not args.prod:
+        uvicorn.run(
+            "app.app:app",
+            host=config.SERVER_HOST,
+            port=config.SERVER_PORT,
+            reload=True,
+        )
+        return
+
+    print(
+        f"Starting {config.SERVER_WORKERS} worker(s) on "
+        f"{config.SERVER_HOST}:{config.SERVER_PORT}, "
+        f"{config.DB_POOL_SIZE} DB connection(s) each, "
+        f"{config.DB_REQUEST_CONNECTIONS} of them for requests"
+    )
+    # SIGTERM/SIGINT: stop accepting, let in-flight requests finish for
+    # up to the graceful timeout, then run the app's shutdown (which
+    # disposes the engine pool) in every worker
     uvicorn.run(
         "app.app:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True,
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
+        workers=config.SERVER_WORKERS,
+        loop=config.SERVER_LOOP,
+        http=config.SERVER_HTTP,
+        timeout_graceful_shutdown=config.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        lifespan="on",
     )
+
+
+if __name__ == "__main__":
+    main()